@@ -32,11 +32,10 @@ class Chain(object):
         """
         Create a joint at specified location
         """
-        # Clear selection
-        cmds.sl(clear=True)
-        
-        # Create joint
-        new_joint = cmds.joint(name, p=position)
+        # Create joint, createNode ignores selection so it
+        # won't get parented under whatever is selected
+        new_joint = cmds.createNode('joint', name=name)
+        cmds.xform(new_joint, worldSpace=True, translation=position)
         self.joints.append(new_joint)
         return new_joint
     
@@ -1,15 +1,62 @@
+import math
+from contextlib import contextmanager
+from functools import partial
+
+import numpy as np
+
 try:
     from maya import cmds
+    from maya.api import OpenMaya as om
 except ImportError:
     print("Must be in a maya environment!")
 
 from rig.config.naming import Naming
-from rig.maya.base import MayaBaseNode
+from rig.maya.base import MayaBaseNode, _exists
 from rig.maya import dag
 
 compose = MayaBaseNode.compose_name
 
 
+@contextmanager
+def _batch_edits():
+    """
+    Group scene edits into a single undo chunk, while viewport refresh,
+    cycle checks and the evaluation manager are switched off.
+    Previous states are restored on exit
+    """
+    cycle_check = cmds.cycleCheck(query=True, evaluation=True)
+    eval_mode = cmds.evaluationManager(query=True, mode=True)[0]
+
+    cmds.undoInfo(openChunk=True)
+    cmds.refresh(suspend=True)
+    cmds.cycleCheck(evaluation=False)
+    cmds.evaluationManager(mode='off')
+
+    try:
+        yield
+    finally:
+        cmds.evaluationManager(mode=eval_mode)
+        cmds.cycleCheck(evaluation=cycle_check)
+        cmds.refresh(suspend=False)
+        cmds.undoInfo(closeChunk=True)
+
+
+def _compute_twist(start_mtx, end_mtx, axis="X"):
+    """
+    Get the twist of end relative to start about axis, through a
+    swing-twist decomposition of their relative rotation
+
+    :param MMatrix start_mtx: world matrix of start
+    :param MMatrix end_mtx: world matrix of end
+    :param str axis: twist axis, X, Y or Z
+    :returns float twist: twist angle in degrees
+    """
+    local_mtx = end_mtx * start_mtx.inverse()
+    quat = om.MTransformationMatrix(local_mtx).rotation(asQuaternion=True)
+    index = 'XYZ'.index(axis.upper())
+    return math.degrees(2 * math.atan2(quat[index], quat.w))
+
+
 def make_space_grp(driver, name=None, parent='grp_spaces'):
     """
     Make a space group that is driven through a parent offset matrix
@@ -25,7 +72,7 @@ def make_space_grp(driver, name=None, parent='grp_spaces'):
         name.role = None
         name = str(name)
     
-    if not cmds.objExists(name):
+    if not _exists(name):
         space = MayaBaseNode(cmds.group(empty=True, name=name))
     else:
         space = MayaBaseNode(name)
@@ -33,13 +80,14 @@ def make_space_grp(driver, name=None, parent='grp_spaces'):
     cmds.connectAttr(driver.plug('worldMatrix[0]'), 
                      space.plug('offsetParentMatrix'))
 
-    if cmds.objExists(parent):
+    if _exists(parent):
         space.parent = parent
     
     return space
     
 
-def add_no_roll_joints(start_jnt, end_jnt, n=3, source_axis="X", target_axis="X"):
+def add_no_roll_joints(start_jnt, end_jnt, n=3, source_axis="X", target_axis="X",
+                       start_pos=None, end_pos=None):
     """
     Add n number of roll joints between start and end joints, that negate
     some portion of the twist of start_jnt, and are parented to start_jnt
@@ -51,6 +99,8 @@ def add_no_roll_joints(start_jnt, end_jnt, n=3, source_axis="X", target_axis="X"
     :param str|MayaBaseNode start_jnt:
     :param str|MayaBaseNode end_jnt:
     :param int n: number of joints to create
+    :param start_pos: world position of start_jnt, queried if not passed
+    :param end_pos: world position of end_jnt, queried if not passed
     :returns tuple(roll_joints, new_nodes): newly created joints and nodes
     """
     roll_joints = list()
@@ -58,83 +108,95 @@ def add_no_roll_joints(start_jnt, end_jnt, n=3, source_axis="X", target_axis="X"
 
     assert n >= 3, "You need at least 3 joints"
 
-    if not isinstance(start_jnt, MayaBaseNode):
-        start_jnt = MayaBaseNode(start_jnt)
-    
-    if not isinstance(end_jnt, MayaBaseNode):
-        end_jnt = MayaBaseNode(end_jnt)
-
-    # Calculate step, we want a joint at the beginning and end
-    step =  1.0 / (n - 1)
+    start_jnt = MayaBaseNode.get(start_jnt)
+    end_jnt = MayaBaseNode.get(end_jnt)
+
+    with _batch_edits():
+        # Calculate step, we want a joint at the beginning and end
+        step =  1.0 / (n - 1)
+
+        # Get a vector from start to end, only query positions not passed in
+        if start_pos is None or end_pos is None:
+            queried = dag.get_positions([start_jnt.long_name, end_jnt.long_name], asArray=True)
+            start_pos = queried[0] if start_pos is None else start_pos
+            end_pos = queried[1] if end_pos is None else end_pos
+
+        a, b = np.array([start_pos, end_pos], dtype=float)
+
+        # Compute every joint position and twist weight up front,
+        # weights are negative to 'negate' the parent's twist about axis
+        offsets = np.arange(n) * step
+        positions = (a + (b - a) * offsets[:, None]).tolist()
+        weights = (offsets - 1.0).tolist()
+
+        side = start_jnt.side
+        descriptor = start_jnt.descriptor
+
+        # Only the descriptor changes between joint names
+        make_name = partial(compose, node_type='joint', role='roll', side=side)
+
+        # Create twist extractor
+        local_mtx = cmds.createNode('multMatrix')
+        cmds.connectAttr(start_jnt.plug('worldMatrix[0]'), local_mtx + '.matrixIn[0]')
+
+        # Cache inverse matrix of start joint as a value on the multMatrix,
+        # no need for a holdMatrix node to keep it around
+        inv_mtx = cmds.getAttr(start_jnt.plug('worldInverseMatrix[0]'))
+        cmds.setAttr(local_mtx + '.matrixIn[1]', inv_mtx, type='matrix')
+
+        # Decompose result matrix
+        twist_dcm = cmds.createNode('decomposeMatrix')
+        cmds.connectAttr(local_mtx + '.matrixSum', twist_dcm + '.inputMatrix')
+
+        # Connect the twist component to a quatToEuler so we can connect it to joint's rotation.
+        # No need for a quatInvert, the inverse of a unit quaternion is its conjugate,
+        # so the twist is negated through the weights instead
+        quat_to_euler = cmds.createNode('quatToEuler')
+        cmds.setAttr(quat_to_euler + '.inputQuatW', 1)
+        cmds.connectAttr(twist_dcm + '.outputQuat{}'.format(source_axis), 
+                         quat_to_euler + '.inputQuat{}'.format(source_axis))
+
+        new_nodes.extend([local_mtx, twist_dcm, quat_to_euler])
+        source_axis = source_axis.upper()
+        target_axis = target_axis.upper()
+
+        # Twist output fans out to every joint
+        twist_plug = quat_to_euler + '.outputRotate{}'.format(source_axis)
+
+        for i in range(n):
+            num = str(i+1).zfill(2)
+
+            # Create a roll extraction joint
+            jnt_name = make_name(descriptor=descriptor + num)
+            new_jnt = MayaBaseNode(cmds.joint(name=jnt_name))
+            new_jnt.snap_to(start_jnt.long_name, rotate=True, translate=True)
+            new_jnt.set_position(positions[i])
+            new_jnt.parent = start_jnt.long_name
+
+            # Freeze rotations
+            cmds.makeIdentity(new_jnt.long_name, r=True, apply=True)
+            roll_joints.append(new_jnt)
+
+            # Multiply result by a factor, so we don't twist all the way
+            # this creates some conversion nodes, but quaternion slerp crashes maya.
+            # Each multiplyDivide scales the twist for three joints, one per channel
+            channel = 'XYZ'[i % 3]
+            if channel == 'X':
+                mult = cmds.createNode("multiplyDivide")
+                new_nodes.append(mult)
+
+            cmds.connectAttr(twist_plug, mult + '.input1{}'.format(channel))
+            cmds.setAttr(mult + '.input2{}'.format(channel), weights[i])
+
+            # Connect result
+            cmds.connectAttr(mult + '.output{}'.format(channel),
+                             new_jnt.long_name + '.rotate{}'.format(target_axis))
 
-    # Get a vector from start to end
-    a, b = dag.get_positions([start_jnt.long_name, end_jnt.long_name])
-
-    target_vector = b - a
-    side = start_jnt.side
-    descriptor = start_jnt.descriptor
-
-    # Create twist extractor
-    local_mtx = cmds.createNode('multMatrix')
-    cmds.connectAttr(start_jnt.plug('worldMatrix[0]'), local_mtx + '.matrixIn[0]')
-    
-    # Hold inverse matrix of start joint
-    hold_mtx = cmds.createNode('holdMatrix')
-    cmds.connectAttr(start_jnt.plug('worldInverseMatrix[0]'), hold_mtx + '.inMatrix')
-    cmds.connectAttr(hold_mtx + '.outMatrix', local_mtx + '.matrixIn[1]')
-    
-    # Disconnect input to cache value
-    cmds.disconnectAttr(start_jnt.plug('worldInverseMatrix[0]'), hold_mtx + '.inMatrix')
-
-    # Decompose result matrix
-    twist_dcm = cmds.createNode('decomposeMatrix')
-    cmds.connectAttr(local_mtx + '.matrixSum', twist_dcm + '.inputMatrix')
-
-    # Output quaternion to an inverse quat to 'negate' the parent's twist about axis
-    quat_inv = cmds.createNode('quatInvert')
-    cmds.connectAttr(twist_dcm + '.outputQuat', quat_inv + '.inputQuat')
-
-    # Connect the inverse to a quatToEuler so we can connect it to joint's rotation
-    quat_to_euler = cmds.createNode('quatToEuler')
-    cmds.setAttr(quat_to_euler + '.inputQuatW', 1)
-    cmds.connectAttr(quat_inv + '.outputQuat{}'.format(source_axis), 
-                     quat_to_euler + '.inputQuat{}'.format(source_axis))
-    
-    new_nodes.extend([local_mtx, hold_mtx, twist_dcm, quat_inv, quat_to_euler])
-    source_axis = source_axis.upper()
-    target_axis = target_axis.upper()
-
-    for i in range(n):
-        num = str(i+1).zfill(2)
-        
-        # Create a roll extraction joint
-        jnt_name = compose(node_type="joint", role="roll", descriptor=descriptor + num, side=side)
-        new_jnt = MayaBaseNode(cmds.joint(name=jnt_name))
-        new_jnt.snap_to(start_jnt.long_name, rotate=True, translate=True)
-        new_jnt.set_position(a + (target_vector * (step * i)))
-        new_jnt.parent = start_jnt.long_name
-        
-        # Freeze rotations
-        cmds.makeIdentity(new_jnt.long_name, r=True, apply=True)
-        roll_joints.append(new_jnt)
-
-        # Multiply result by a factor, so we don't twist all the way
-        # this creates some conversion nodes, but quaternion slerp crashes maya
-        mdl = cmds.createNode("multDoubleLinear")
-        cmds.connectAttr(quat_to_euler + '.outputRotate{}'.format(source_axis), mdl + '.input1')
-        cmds.setAttr(mdl + '.input2', 1 - (step * i))
-        
-        # Connect result
-        cmds.connectAttr(mdl + '.output', new_jnt.long_name + '.rotate{}'.format(target_axis))
-        
-        # Store nodes
-        new_nodes.append(mdl)
-        
-    
     return roll_joints, new_nodes
 
 
-def add_roll_joints(start_jnt, end_jnt, n=2, source_axis="X", target_axis="X"):
+def add_roll_joints(start_jnt, end_jnt, n=2, source_axis="X", target_axis="X",
+                    bake=False, start_pos=None, end_pos=None):
     """
     Add n number of roll joints between start and end joints, that gain some
     proportion of the twist of the end_joint, and are parented to start_jnt
@@ -146,80 +208,110 @@ def add_roll_joints(start_jnt, end_jnt, n=2, source_axis="X", target_axis="X"):
     :param str|MayaBaseNode start_jnt:
     :param str|MayaBaseNode end_jnt:
     :param int n:
-    :returns list roll_joints: newly created joints
+    :param bool bake:
+        Set the current twist as a value on roll joints,
+        instead of creating nodes to drive them
+    :param start_pos: world position of start_jnt, queried if not passed
+    :param end_pos: world position of end_jnt, queried if not passed
+    :returns tuple(roll_joints, new_nodes): newly created joints and nodes
     """
     roll_joints = list()
-    new_nodes = list()
 
-    if not isinstance(start_jnt, MayaBaseNode):
-        start_jnt = MayaBaseNode(start_jnt)
-    
-    if not isinstance(end_jnt, MayaBaseNode):
-        end_jnt = MayaBaseNode(end_jnt)
-
-    # Calculate step
-    step =  1.0 / n
-
-    # Get a vector from start to end
-    a, b = dag.get_positions([start_jnt.long_name, end_jnt.long_name])
-
-    target_vector = b - a
-    side = start_jnt.side
-    descriptor = start_jnt.descriptor
-
-    # Create twist extractor
-    # First, create a multMatrix node to set our target in local space
-    local_mtx = cmds.createNode('multMatrix')
-    cmds.connectAttr(end_jnt.plug('worldMatrix[0]'), local_mtx + '.matrixIn[0]')
-    cmds.connectAttr(start_jnt.plug('worldInverseMatrix[0]'), local_mtx + '.matrixIn[1]')
-
-    # Decompose result
-    local_dcm = cmds.createNode('decomposeMatrix')
-    cmds.connectAttr(local_mtx + '.matrixSum', local_dcm + '.inputMatrix')
-
-    # Convert it to degrees
-    quat_to_euler = cmds.createNode('quatToEuler')
-    cmds.setAttr(quat_to_euler + '.inputQuatW', 1)
-    cmds.connectAttr(local_dcm + '.outputQuat{}'.format(source_axis), 
-                     quat_to_euler + '.inputQuat{}'.format(source_axis))
-
-    new_nodes.extend([local_mtx, local_dcm, quat_to_euler])
-
-    source_axis = source_axis.upper()
-    target_axis = target_axis.upper()
-
-    for i in range(1, n+1):
-        # Compose a name for the new joint
-        num = str(i).zfill(2)
-        jnt_name = compose(node_type='joint', role='roll', descriptor=descriptor + num, side=side)
-
-        # Create roll joint and snap to location
-        new_jnt = MayaBaseNode(cmds.joint(name=jnt_name))
-        new_jnt.snap_to(start_jnt.long_name)
-        new_jnt.set_position(a + (target_vector * (step * i)))
-
-        # Freeze joint rotations
-        cmds.makeIdentity(new_jnt, r=True, apply=True)
-        cmds.setAttr(new_jnt.plug('displayLocalAxis'), 1)
-
-        # Parent under start_jnt and append to result
-        new_jnt.parent = start_jnt.long_name
-        roll_joints.append(new_jnt.long_name)
-
-        # Multiply result by a factor, so we don't twist all the way
-        # this creates some conversion nodes, but quaternion slerp crashes maya
-        mdl = cmds.createNode("multDoubleLinear")
-        cmds.connectAttr(quat_to_euler + '.outputRotate{}'.format(source_axis), mdl + '.input1')
-        cmds.setAttr(mdl + '.input2', step * i)
-        
-        # Connect result
-        cmds.connectAttr(mdl + '.output', new_jnt.long_name + '.rotate{}'.format(target_axis))
-        
-        # Store nodes
-        new_nodes.extend([quat_to_euler])
+    # Nodes shared by all joints, and per joint multipliers
+    shared_nodes = list()
+    mdl_nodes = list()
 
-    
-    return roll_joints, new_nodes
+    start_jnt = MayaBaseNode.get(start_jnt)
+    end_jnt = MayaBaseNode.get(end_jnt)
+
+    with _batch_edits():
+        # Calculate step
+        step =  1.0 / n
+
+        # Get a vector from start to end, only query positions not passed in
+        if start_pos is None or end_pos is None:
+            queried = dag.get_positions([start_jnt.long_name, end_jnt.long_name], asArray=True)
+            start_pos = queried[0] if start_pos is None else start_pos
+            end_pos = queried[1] if end_pos is None else end_pos
+
+        a, b = np.array([start_pos, end_pos], dtype=float)
+
+        # Compute every joint position and twist weight up front,
+        # first joint starts one step away from start_jnt
+        offsets = np.arange(1, n+1) * step
+        positions = (a + (b - a) * offsets[:, None]).tolist()
+        weights = offsets.tolist()
+
+        side = start_jnt.side
+        descriptor = start_jnt.descriptor
+
+        # Only the descriptor changes between joint names
+        make_name = partial(compose, node_type='joint', role='roll', side=side)
+
+        source_axis = source_axis.upper()
+        target_axis = target_axis.upper()
+
+        if bake:
+            # Compute twist once, and scale it for each joint
+            twist = _compute_twist(start_jnt.world_matrix, end_jnt.world_matrix, source_axis)
+            twists = (offsets * twist).tolist()
+        else:
+            # Create twist extractor
+            # First, create a multMatrix node to set our target in local space
+            local_mtx = cmds.createNode('multMatrix')
+            cmds.connectAttr(end_jnt.plug('worldMatrix[0]'), local_mtx + '.matrixIn[0]')
+            cmds.connectAttr(start_jnt.plug('worldInverseMatrix[0]'), local_mtx + '.matrixIn[1]')
+
+            # Decompose result
+            local_dcm = cmds.createNode('decomposeMatrix')
+            cmds.connectAttr(local_mtx + '.matrixSum', local_dcm + '.inputMatrix')
+
+            # Convert it to degrees
+            quat_to_euler = cmds.createNode('quatToEuler')
+            cmds.setAttr(quat_to_euler + '.inputQuatW', 1)
+            cmds.connectAttr(local_dcm + '.outputQuat{}'.format(source_axis), 
+                             quat_to_euler + '.inputQuat{}'.format(source_axis))
+
+            shared_nodes.extend([local_mtx, local_dcm, quat_to_euler])
+
+            # Twist output fans out to every joint
+            twist_plug = quat_to_euler + '.outputRotate{}'.format(source_axis)
+
+        for i in range(1, n+1):
+            # Compose a name for the new joint
+            num = str(i).zfill(2)
+            jnt_name = make_name(descriptor=descriptor + num)
+
+            # Create roll joint and snap to location
+            new_jnt = MayaBaseNode(cmds.joint(name=jnt_name))
+            new_jnt.snap_to(start_jnt.long_name)
+            new_jnt.set_position(positions[i-1])
+
+            # Freeze joint rotations
+            cmds.makeIdentity(new_jnt, r=True, apply=True)
+            cmds.setAttr(new_jnt.plug('displayLocalAxis'), 1)
+
+            # Parent under start_jnt and append to result
+            new_jnt.parent = start_jnt.long_name
+            roll_joints.append(new_jnt.long_name)
+
+            if bake:
+                cmds.setAttr(new_jnt.long_name + '.rotate{}'.format(target_axis), twists[i-1])
+                continue
+
+            # Multiply result by a factor, so we don't twist all the way
+            # this creates some conversion nodes, but quaternion slerp crashes maya
+            mdl = cmds.createNode("multDoubleLinear")
+            cmds.connectAttr(twist_plug, mdl + '.input1')
+            cmds.setAttr(mdl + '.input2', weights[i-1])
+
+            # Connect result
+            cmds.connectAttr(mdl + '.output', new_jnt.long_name + '.rotate{}'.format(target_axis))
+
+            # Store nodes
+            mdl_nodes.append(mdl)
+
+    return roll_joints, shared_nodes + mdl_nodes
 
 
 def drive_constrained(drivers, driven, prefix="ikfkSwitch"):
@@ -251,21 +343,22 @@ def drive_blended_mtx(driver_a, driver_b, driven, prefix="ikfkSwitch", blend_att
     blend_mtx = compose(node_type="blendMtx", role=prefix, descriptor=desc, side=side)
     blend_mtx = cmds.createNode("blendMatrix", name=blend_mtx)
 
-    # Create a mult matrix node to input the inverse of the driven's parent
-    driven_par = driven.parent
+    # Create a mult matrix node to input the inverse of the driven's parent,
+    # both drivers are brought into this space so get its plug once
+    driven_par_inv = "{0}.worldInverseMatrix[0]".format(driven.parent_name)
 
     # Multiply driven parent's world inverse * driver A's world mat
     mult_a = compose(node_type="multMtx", role=prefix, descriptor=desc, side=side)
     mult_a = cmds.createNode("multMatrix", name=mult_a)
     cmds.connectAttr(driver_a.plug('worldMatrix[0]'), mult_a + '.matrixIn[0]')
-    cmds.connectAttr(driven_par.plug('worldInverseMatrix[0]'), mult_a + '.matrixIn[1]')
+    cmds.connectAttr(driven_par_inv, mult_a + '.matrixIn[1]')
     cmds.connectAttr(mult_a + '.matrixSum', blend_mtx + '.inputMatrix')
     
     # And do the same with driver B
     mult_b = compose(node_type="multMtx", role=prefix, descriptor=desc, side=side)
     mult_b = cmds.createNode("multMatrix", name=mult_b)
     cmds.connectAttr(driver_b.plug('worldMatrix[0]'), mult_b + '.matrixIn[0]')
-    cmds.connectAttr(driven_par.plug('worldInverseMatrix[0]'), mult_b + '.matrixIn[1]')
+    cmds.connectAttr(driven_par_inv, mult_b + '.matrixIn[1]')
     cmds.connectAttr(mult_b + '.matrixSum', blend_mtx + '.target[0].targetMatrix')
 
     # Zero out output rotation by multiplying this result times the inverse of the driver
@@ -273,10 +366,10 @@ def drive_blended_mtx(driver_a, driver_b, driven, prefix="ikfkSwitch", blend_att
     # First, create a hold matrix to store the driver's inverse matrix
     hold_mtx = compose(node_type="holdMtx", role=prefix, descriptor="{}DrvnParentInv".format(desc))
     hold_mtx = cmds.createNode("holdMatrix", name=hold_mtx)
-    cmds.connectAttr(driven.plug('inverseMatrix'), hold_mtx + '.inMatrix')
     
-    # Now snip it (it's ok, the values will hold)
-    cmds.disconnectAttr(driven.plug('inverseMatrix'), hold_mtx + '.inMatrix')
+    # Set it as a value, no need for a live connection
+    inv_mtx = cmds.getAttr(driven.plug('inverseMatrix'))
+    cmds.setAttr(hold_mtx + '.inMatrix', inv_mtx, type='matrix')
 
     # Get result in local space
     mult_local_mtx = compose(node_type="multMtx", role=prefix, descriptor="{}LocalRot".format(desc), side=side)
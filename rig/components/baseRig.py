@@ -20,7 +20,7 @@ class BaseRig(object):
     def __init__(self, joints, descriptor=None, color=None):
         if isinstance(joints, string_types):
             print("This is a str type")
-            self.joints = cmds.listRelatives(joints, allDescendents=True)
+            self.joints = cmds.listRelatives(joints, allDescendents=True, type='joint') or []
         else:
             self.joints = joints
         self.naming = BaseRig.NAMING
@@ -8,7 +8,7 @@ except (ImportError, ModuleNotFoundError):
     raise
 
 from rig.components.baseRig import BaseRig
-from rig.maya.base import MayaBaseNode
+from rig.maya.base import _undo_chunk
 from rig.maya.control import Control
 
 
@@ -26,11 +26,14 @@ class FkChain(BaseRig):
         ancestor = None
         controls = list()
 
-        for jnt in self.joints:
-            jnt = MayaBaseNode(jnt)
-            side = jnt.side
-            desc = self.descriptor or jnt.descriptor
-            ctrl = Control.create(descriptor=desc, role='fk', side=side, snap_to=jnt.long_name, shape=self.shape)
+        # Parse naming tokens of all joints up front, from names
+        # without path or namespace, no need to wrap each joint node
+        names = [self.naming(jnt.rsplit('|', 1)[-1].split(':')[-1]) for jnt in self.joints]
+
+        for jnt, name in zip(self.joints, names):
+            side = name.side
+            desc = self.descriptor or name.descriptor
+            ctrl = Control.create(descriptor=desc, role='fk', side=side, snap_to=jnt, shape=self.shape)
             
             if not self.color:
                 print(side)
@@ -55,7 +58,11 @@ class FkChain(BaseRig):
 
     def connect(self):
         constraints = list()
-        for con, jnt in zip(self.controls, self.joints):
-            constraint = cmds.parentConstraint(con.long_name, jnt, maintainOffset=False)
-            constraints.append(constraint)
+
+        # Constrain all joints as a single undo step
+        with _undo_chunk():
+            for con, jnt in zip(self.controls, self.joints):
+                constraint = cmds.parentConstraint(con.long_name, jnt, maintainOffset=False)
+                constraints.append(constraint)
+
         self.constraints = constraints
\ No newline at end of file
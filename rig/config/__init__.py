@@ -9,7 +9,6 @@ For now, this base config and default naming class can serve our
 general purpose.
 """
 
-import re
 import os
 import sqlite3
 from collections import OrderedDict
@@ -19,17 +18,7 @@ def get_control_lib(file_name):
     Returns an expected path for controls file
     :param str file_name:
     """
-    path = re.split(r'/|\\', os.path.dirname(__file__))
-    
-    # Add a separator to windows drives (c: -> c:\)
-    # otherwise ignored by os.path.join
-    if path[0].endswith(':'):
-        path[0] = path[0] + os.sep
-    
-    # Add file name
-    path.extend([file_name])
-    
-    return os.path.join(*path)
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name)
 
 class Config(object):
     """
@@ -97,4 +86,7 @@ class Config(object):
         ('side', SIDES)
     ])
 
+    # Token and mapping pairs in TokenOrder, for quicker iteration
+    TokenOrderItems = tuple(TokenOrder.items())
+
     
\ No newline at end of file
@@ -1,11 +1,70 @@
 import re
 from rig.config import Config
 
+
+def _compile_token_patterns(tokens, delimiter):
+    """
+    Compile a search pattern for each token, matching the token preceded
+    by a delimiter and optionally followed by a digit
+    :param iterable tokens:
+    :param str delimiter:
+    :returns dict patterns: token -> compiled pattern
+    """
+    patterns = dict()
+    for token in tokens:
+        pattern = re.escape(delimiter + token) + r'\d?'
+        patterns[token] = re.compile(pattern, flags=re.IGNORECASE)
+    return patterns
+
+# Side and region patterns, compiled on first use per config class
+_TOKEN_PATTERNS = dict()
+
+
+def _get_token_patterns(config):
+    """
+    Get side and region patterns for a config, compiling them once
+    :param Config config:
+    :returns tuple(dict, dict) patterns: side patterns, region patterns
+    """
+    patterns = _TOKEN_PATTERNS.get(config)
+    if patterns is None:
+        patterns = (_compile_token_patterns(config.SIDES.values(), config.DELIMITER),
+                    _compile_token_patterns(config.REGIONS.values(), config.DELIMITER))
+        _TOKEN_PATTERNS[config] = patterns
+    return patterns
+
+# Known token values for constant time membership tests, built on first use per config class
+_TOKEN_SETS = dict()
+
+
+def _get_token_sets(config):
+    """
+    Get sets of known side, region and node type tokens for a config
+    :param Config config:
+    :returns tuple(frozenset, frozenset, frozenset) sets: sides, regions, node types
+    """
+    sets = _TOKEN_SETS.get(config)
+    if sets is None:
+        sets = (frozenset(config.SIDES.values()),
+                frozenset(config.REGIONS.values()),
+                frozenset(config.NODETYPES.values()))
+        _TOKEN_SETS[config] = sets
+    return sets
+
+
 class Naming(object):
     # Default configuration
     CONFIG = Config
     NODETYPE = None
 
+    # Names already composed, keyed by class and token values, see compose_name
+    _COMPOSE_CACHE = {}
+    _COMPOSE_CACHE_SIZE = 4096
+
+    # No per instance __dict__, these are created in bulk during builds
+    __slots__ = ('_name', '_node_type', '_role', '_descriptor',
+                 '_region', '_side', 'delimiter', '_dirty')
+
     def __init__(self, 
                  name, 
                  node_type=None, 
@@ -21,6 +80,9 @@ class Naming(object):
         self._region = region
         self._side = side
         self.delimiter = self.CONFIG.DELIMITER
+
+        # Whether tokens changed since the name was last composed
+        self._dirty = False
         
         # Try to pop name components
         if not any(k for k in [node_type, role, descriptor, region, side]):
@@ -38,35 +100,34 @@ class Naming(object):
         
         # Otherwise, let's go one by one to match
         # tokens to properties
-        for token in tokens[:]:
-            if any(token == val for val in self.CONFIG.SIDES.values()):
+        side_set, region_set, nodetype_set = _get_token_sets(self.CONFIG)
+        leftover = list()
+        for token in tokens:
+            if token in side_set:
                 self._side = token
-                tokens.remove(token)
-            
-            elif any(token == val for val in self.CONFIG.REGIONS.values()):
+            elif token in region_set:
                 self._region = token
-                tokens.remove(token)
-            
-            elif any(token == val for val in self.CONFIG.NODETYPES.values()):
+            elif token in nodetype_set:
                 self._node_type = token
-                tokens.remove(token)
-        
+            else:
+                leftover.append(token)
+        tokens = leftover
+
         # The rest of the tokens are arbitrary in values
         if len(tokens) == 1:
             self._descriptor = tokens[0]
         
         elif len(tokens) == 2:
-            order = list(tok for tok in self.CONFIG.TokenOrder if tok in ['role', 'descriptor'])
-            while tokens:
-                for token in order:
-                    setattr(self, '_{}'.format(token), tokens[0])
-                    tokens.remove(tokens[0])
+            # Assign in the order role and descriptor follow in TokenOrder
+            order = [tok for tok in self.CONFIG.TokenOrder if tok in ('role', 'descriptor')]
+            for key, token in zip(order, tokens):
+                setattr(self, '_{}'.format(key), token)
 
     def __str__(self):
-        return self._name
+        return self.name
 
     def __repr__(self):
-        return self._name
+        return self.name
 
     def as_dict(self):
         return dict(node_type=self._node_type, 
@@ -75,17 +136,47 @@ class Naming(object):
                     region=self._region, 
                     side=self._side)
 
+    def _compose_from_self(self):
+        """
+        Same as compose_name, reading tokens straight from this instance
+        instead of packing and unpacking a keyword dictionary
+        """
+        new_name = list()
+
+        for token, mapping in self.CONFIG.TokenOrderItems:
+            v = getattr(self, '_' + token)
+
+            # If no node_type value set, use class variable
+            if not v and token == 'node_type':
+                v = self.NODETYPE
+
+            if v:
+                new_name.append(mapping.get(v, v))
+
+        return self.CONFIG.DELIMITER.join(new_name)
+
+    def _mark_dirty(self):
+        """
+        Called by token setters, the name is recomposed on next read
+        """
+        self._dirty = True
+
     @property
     def tokens(self):
-        return self._name.split(self.delimiter)
+        return self.name.split(self.delimiter)
 
     @property
     def name(self):
+        # Recompose lazily, so setting several tokens in a row
+        # only builds the name once
+        if self._dirty:
+            self._name = self._compose_from_self()
+            self._dirty = False
         return self._name
     
     @name.setter
     def name(self, new_name):
-        if new_name == self._name:
+        if new_name == self.name:
             return
         else:
             self._name = new_name
@@ -100,7 +191,7 @@ class Naming(object):
             return
         else:
             self._node_type = self.CONFIG.NODETYPES.get(new_type, new_type)
-            self.name = self.compose_name(**self.as_dict())
+            self._mark_dirty()
 
     @property
     def side(self):
@@ -110,9 +201,7 @@ class Naming(object):
         """
         # Otherwise let's find the side
         if not self._side:
-            for token in self.CONFIG.SIDES.values():
-                pattern = re.escape(self.CONFIG.DELIMITER + token) + r'\d?'
-                matcher = re.compile(pattern, flags=re.IGNORECASE)
+            for matcher in _get_token_patterns(self.CONFIG)[0].values():
                 match = matcher.search(self.name)
                 if match:
                     self._side = match.group(0)
@@ -126,7 +215,7 @@ class Naming(object):
             return
         else:
             self._side = self.CONFIG.SIDES.get(new_side, new_side)
-            self.name = self.compose_name(**self.as_dict())
+            self._mark_dirty()
 
     @property
     def region(self):
@@ -139,9 +228,7 @@ class Naming(object):
         """
         # Otherwise let's find the region
         if not self._region:
-            for token in self.CONFIG.REGIONS.values():
-                pattern = re.escape(self.CONFIG.DELIMITER + token) + r'\d?'
-                matcher = re.compile(pattern, flags=re.IGNORECASE)
+            for matcher in _get_token_patterns(self.CONFIG)[1].values():
                 match = matcher.search(self.name)
                 if match:
                     self._region = match.group(0)
@@ -155,7 +242,7 @@ class Naming(object):
             return
         else:
             self._region = new_region
-            self._name = self.compose_name(**self.as_dict())
+            self._mark_dirty()
 
     @property
     def descriptor(self):
@@ -173,7 +260,7 @@ class Naming(object):
             return
         else:
             self._descriptor = new_descriptor
-            self._name = self.compose_name(**self.as_dict())
+            self._mark_dirty()
 
     @property
     def role(self):
@@ -192,7 +279,7 @@ class Naming(object):
             return
         else:
             self._role = new_role
-            self._name = self.compose_name(**self.as_dict())
+            self._mark_dirty()
 
     @classmethod
     def compose_name(cls, **kwargs):
@@ -215,24 +302,36 @@ class Naming(object):
         :returns str name: new name composed from keyword arguments
         """
         
+        values = tuple(kwargs.get(token) for token, _ in cls.CONFIG.TokenOrderItems)
+        # Class carries both NODETYPE and CONFIG, which decide the result
+        key = (cls,) + values
+
+        name = Naming._COMPOSE_CACHE.get(key)
+        if name is not None:
+            return name
+
         new_name = list()
-        
-        # If no node_type value passed, use class variable
-        if not kwargs.get('node_type', None):
-            kwargs.update(dict(node_type=cls.NODETYPE))
 
         # Search our TokenOrder dictionary to compose a name
         # in that order, and use internal mapping to shorten strings
         # and follow conventions
-        for token in cls.CONFIG.TokenOrder:
-            if token in kwargs:
-                if not kwargs.get(token, None):
+        for (token, mapping), v in zip(cls.CONFIG.TokenOrderItems, values):
+            if not v:
+                # If no node_type value passed, use class variable
+                if token == 'node_type':
+                    v = cls.NODETYPE
+                if not v:
                     continue
-                v = kwargs[token]
-                token_name = cls.CONFIG.TokenOrder[token].get(v, v)
-                new_name.append(token_name)
-        
-        return cls.CONFIG.DELIMITER.join(new_name)
+            new_name.append(mapping.get(v, v))
+
+        name = cls.CONFIG.DELIMITER.join(new_name)
+
+        # Keep the cache bounded, names of a single build fit comfortably
+        if len(Naming._COMPOSE_CACHE) >= Naming._COMPOSE_CACHE_SIZE:
+            Naming._COMPOSE_CACHE.clear()
+        Naming._COMPOSE_CACHE[key] = name
+
+        return name
 
     @classmethod
     def compose(cls, **kwargs):
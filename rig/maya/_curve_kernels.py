@@ -0,0 +1,33 @@
+"""
+Array kernels for transforming curve cvs in bulk
+"""
+
+import numpy as np
+
+
+def points_to_array(points):
+    """
+    Copy an MPointArray into an (N, 4) array, in a single pass
+    :param MPointArray points:
+    :returns ndarray array:
+    """
+    return np.array([[p.x, p.y, p.z, p.w] for p in points], dtype=np.float64)
+
+
+def matrix_to_array(matrix):
+    """
+    :param MMatrix matrix:
+    :returns ndarray array: 4x4 array
+    """
+    return np.array(list(matrix), dtype=np.float64).reshape(4, 4)
+
+
+def transform_cvs(points, matrix):
+    """
+    Transform all points by a matrix with one product,
+    maya points are row vectors so this is points * matrix
+    :param ndarray points: (N, 4) array
+    :param ndarray matrix: 4x4 array
+    :returns ndarray points: new (N, 4) array
+    """
+    return np.dot(points, matrix)
@@ -2,6 +2,10 @@
 Definition for base node class
 """
 
+import math
+import weakref
+from contextlib import contextmanager
+
 try:
     from maya import cmds
     from maya.api import OpenMaya as om
@@ -15,6 +19,32 @@ from rig.maya import dag, linAlg, get_logger
 
 log = get_logger(__name__)
 
+
+def _exists(name):
+    """
+    Cheaper cmds.objExists, works for nodes and plugs
+    :param str name:
+    :returns bool exists:
+    """
+    try:
+        om.MSelectionList().add(str(name))
+        return True
+    except RuntimeError:
+        return False
+
+
+@contextmanager
+def _undo_chunk():
+    """
+    Group every undoable edit made inside into a single undo chunk
+    """
+    cmds.undoInfo(openChunk=True)
+    try:
+        yield
+    finally:
+        cmds.undoInfo(closeChunk=True)
+
+
 class MayaBaseNode(Naming):
     """
     Base class to handle dag nodes in maya
@@ -27,6 +57,14 @@ class MayaBaseNode(Naming):
     :keyword str side:
     """
 
+    # Live instances keyed by class and full path name, see get
+    _instances = weakref.WeakValueDictionary()
+
+    # Weak referenceable for _instances, no per instance __dict__ otherwise
+    __slots__ = ('_list', '_mobject', '_dag', '_transform_set',
+                 '_parent', '_shapes_cache',
+                 '__weakref__')
+
     def __init__(self,                
                  name, 
                  node_type=None, 
@@ -38,8 +76,10 @@ class MayaBaseNode(Naming):
         if isinstance(name, type(self)):
             name = name.short_name
 
-        assert cmds.objExists(name), "{} doesn't exist".format(name)
-        
+        # Resolve name once, everything else is read from the same list,
+        # get_list raises if the node doesn't exist
+        self._list = dag.get_list(str(name))
+
         # instance naming related class properties
         super(MayaBaseNode, self).__init__(name, 
                                            node_type=node_type,
@@ -48,11 +88,79 @@ class MayaBaseNode(Naming):
                                            region=region,
                                            side=side)
 
-        self._list = dag.get_list(name)
-        self._mobject = dag.get_mobjects(name, self._list)[0]
-        self._dag = dag.get_dag_paths(name, self._list)[0]
-        self._transform_set = dag.get_function_sets(name, fn=om.MFnTransform)[0]
+        self._mobject = self._list.getDependNode(0)
+        self._dag = self._list.getDagPath(0)
+        self._transform_set = om.MFnTransform(self._dag)
+
+        self._invalidate()
+
+    def _setup(self):
+        """
+        Subclass specific setup of a wrapped node, subclasses run it
+        at the end of __init__, _from_dag runs it since it skips __init__
+        """
+        pass
+
+    def _invalidate(self):
+        """
+        Forget cached shape names, call after renaming,
+        reparenting or reshaping this node
+        """
+        self._shapes_cache = None
     
+    @classmethod
+    def _from_dag(cls, dag_path):
+        """
+        Fast constructor for nodes that are already resolved,
+        skips the name lookups done by __init__
+
+        :param MDagPath dag_path: dag path to node
+        :returns MayaBaseNode node:
+        """
+        node = cls.__new__(cls)
+
+        # Decompose from the name, same as __init__ with no tokens given
+        Naming.__init__(node, dag_path.partialPathName())
+        if node._node_type is None:
+            node._node_type = cls.NODETYPE
+
+        node._dag = om.MDagPath(dag_path)
+        node._list = om.MSelectionList().add(node._dag)
+        node._mobject = node._dag.node()
+        node._transform_set = om.MFnTransform(node._dag)
+        node._invalidate()
+        node._setup()
+
+        return node
+
+    @classmethod
+    def get(cls, name):
+        """
+        Get a class instance for name, reusing a live instance
+        of the same class wrapping the same node if there is one
+
+        :param str|MayaBaseNode name: Name of node to instance a class for
+        :returns MayaBaseNode node:
+        """
+        if isinstance(name, cls):
+            return name
+
+        try:
+            long_name = om.MSelectionList().add(str(name)).getDagPath(0).fullPathName()
+        except (RuntimeError, TypeError):
+            # Let the constructor report missing nodes
+            return cls(name)
+
+        key = (cls, long_name)
+        node = MayaBaseNode._instances.get(key)
+
+        # Make sure cached node hasn't been renamed or reparented since
+        if node is None or node.long_name != long_name:
+            node = cls(name)
+            MayaBaseNode._instances[key] = node
+
+        return node
+
     @classmethod
     def from_selection(cls):
         """
@@ -65,26 +173,47 @@ class MayaBaseNode(Naming):
         else:
             raise RuntimeError("Nothing is selected.")
 
-    def set_position(self, position, space='world'):
+    def set_position(self, position, space='world', undoable=True):
         """
         Sets this object's position in desired space (local or world),
         calls cmds.xform
+
         :param tuple position:
         :param str space:
+        :param bool undoable: when False, set it through the cached
+                              transform function set instead, which is
+                              faster but not undoable
         """
         world = space.lower() == 'world'
-        position = tuple(position)
-        cmds.xform(self.long_name, worldSpace=world, translation=position)
 
-    def set_rotation(self, rotation, space='world'):
+        if undoable:
+            cmds.xform(self.long_name, worldSpace=world, translation=tuple(position))
+        else:
+            space_enum = om.MSpace.kWorld if world else om.MSpace.kTransform
+            self._transform_set.setTranslation(om.MVector(*position), space_enum)
+
+    def set_rotation(self, rotation, space='world', undoable=True):
         """
         Set this object's rotation in desired space (local or world),
         calls cmds.xform
-        :param tuple rotation:
+
+        :param tuple rotation: euler rotation in degrees
         :param str space:
+        :param bool undoable: when False, set it through the cached
+                              transform function set instead, which is
+                              faster but not undoable
         """
         world = space.lower() == 'world'
-        cmds.xform(self.long_name, worldSpace=world, ro=rotation)
+
+        if undoable:
+            cmds.xform(self.long_name, worldSpace=world, rotation=tuple(rotation))
+        else:
+            space_enum = om.MSpace.kWorld if world else om.MSpace.kTransform
+
+            # Transformation matrix rotation orders start at 1, euler ones at 0
+            order = self._transform_set.rotationOrder() - 1
+            euler = om.MEulerRotation([math.radians(a) for a in rotation], order)
+            self._transform_set.setRotation(euler, space_enum)
 
     def snap_to(self, node, rotate=True, translate=True):
         """
@@ -92,13 +221,17 @@ class MayaBaseNode(Naming):
         :param str|MayaBaseObject node: the object to snap to
         :param bool rotate: Whether to do align orientation
         :param bool translate: Whether to align position
+
+        .. note::
+            This action is not undoable
         """
-        if isinstance(node, type(self)):
-            node = node.long_name
-        
-        assert cmds.objExists(node), "{} doesn't exist".format(node)
-        
-        linAlg.snap(self.long_name, node, rotate=rotate, translate=translate)
+        if isinstance(node, MayaBaseNode):
+            target = node._dag
+        else:
+            assert _exists(node), "{} doesn't exist".format(node)
+            target = om.MSelectionList().add(node).getDagPath(0)
+
+        linAlg.snap_dag_paths(self._dag, target, rotate=rotate, translate=translate)
 
     def plug(self, attr):
         """
@@ -115,7 +248,7 @@ class MayaBaseNode(Naming):
         """
         Add attribute to this node
         """
-        if cmds.objExists(self.plug(attr)):
+        if _exists(self.plug(attr)):
             raise RuntimeError("Attribute {} already exists".format(attr))
         
         cmds.addAttr(self.long_name, longName=attr, **kwargs)
@@ -131,11 +264,26 @@ class MayaBaseNode(Naming):
         """
         Return class instances based on selection
         """
-        sel = cmds.ls(selection=True, long=True)
-        if not sel:
+        sel = om.MGlobal.getActiveSelectionList()
+        if not sel.length():
             return
         else:
-            return [cls(o) for o in sel]
+            return [cls._from_dag(sel.getDagPath(i)) for i in range(sel.length())]
+
+    def _mark_dirty(self):
+        """
+        Recompose and rename the node right away when a token changes,
+        the name getter reads from maya and never looks at _dirty
+        """
+        new_name = self._compose_from_self()
+        self._dirty = False
+        self.name = new_name
+
+    @property
+    def tokens(self):
+        # _name is kept in sync by _mark_dirty, and is already set
+        # when decompose_name runs, before the dag path is resolved
+        return self._name.split(self.delimiter)
 
     @property
     def name(self):
@@ -151,6 +299,7 @@ class MayaBaseNode(Naming):
             self._name = new_name
             log.debug("New name: {}".format(new_name))
             cmds.rename(self.long_name, new_name)
+            self._invalidate()
 
     @property
     def position(self):
@@ -164,12 +313,27 @@ class MayaBaseNode(Naming):
         """
         Get parent object of this node, as a class instance
         """
-        par = cmds.listRelatives(self.long_name, parent=True)
-        if par:
-            return type(self)(par[0])
+        dag_path = om.MDagPath(self._dag)
+        if dag_path.length() > 1:
+            dag_path.pop()
+            return type(self)._from_dag(dag_path)
         else:
             return None
     
+    @property
+    def parent_name(self):
+        """
+        Get full path name of this node's parent, without
+        building a class instance for it
+        :returns str|None parent_name:
+        """
+        dag_path = om.MDagPath(self._dag)
+        if dag_path.length() > 1:
+            dag_path.pop()
+            return dag_path.fullPathName()
+        else:
+            return None
+
     @parent.setter
     def parent(self, par):
         if isinstance(par, MayaBaseNode):
@@ -177,6 +341,7 @@ class MayaBaseNode(Naming):
         
         try:
             cmds.parent(self.long_name, par)
+            self._invalidate()
             log.debug("Parented {} under {}".format(self.nice_name, par))
             self._parent = par
         except RuntimeError:
@@ -204,16 +369,18 @@ class MayaBaseNode(Naming):
         """
         short_name = self.short_name
         if ':' in short_name:
-            return short_name.rsplit(':', 1)
+            return short_name.rsplit(':', 1)[0]
         else:
             return ''
     
     @namespace.setter
     def namespace(self, ns):
-        if ns == self.namespace:
+        namespace = self.namespace
+        if ns == namespace:
             return
         else:
-            cmds.rename(self.short_name, self.short_name.replace(self.namespace, ns))
+            cmds.rename(self.short_name, self.short_name.replace(namespace, ns))
+            self._invalidate()
     
     @property
     def nice_name(self):
@@ -231,6 +398,7 @@ class MayaBaseNode(Naming):
         """
         :returns str long_name: full path name
         """
+        # Read live from the dag path, it follows renames and reparents
         return self._dag.fullPathName()
     
     @property
@@ -243,13 +411,27 @@ class MayaBaseNode(Naming):
     @property
     def shapes(self):
         """
-        :returns list shapes: shapes under this object
+        :returns list shapes: shapes under this object, cached until
+                              this node is renamed, moved or given new shapes
         """
-        return cmds.listRelatives(self.long_name, 
-                                  children=True, 
-                                  shapes=True, 
-                                  noIntermediate=True) or []
-    
+        if self._shapes_cache is None:
+            fn_dag = om.MFnDagNode(self._dag)
+            shapes = []
+
+            for i in range(fn_dag.childCount()):
+                child = fn_dag.child(i)
+                if not child.hasFn(om.MFn.kShape):
+                    continue
+                if om.MFnDagNode(child).isIntermediateObject:
+                    continue
+                shape_path = om.MDagPath(self._dag)
+                shape_path.push(child)
+                shapes.append(shape_path.partialPathName())
+
+            self._shapes_cache = shapes
+
+        return list(self._shapes_cache)
+
     @property
     def shape(self):
         """
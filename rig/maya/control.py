@@ -1,5 +1,6 @@
 try:
     from maya import cmds, mel
+    from maya.api import OpenMaya as om
 except ImportError:
     print("Must be in a maya environment!")
     raise
@@ -7,14 +8,16 @@ except ImportError:
 # native
 import os
 import json
-import pickle
 from six import string_types
 
+import numpy as np
+
 from rig.config import naming
 from rig.utils import dataIO
 from rig.maya import get_logger
-from rig.maya.base import MayaBaseNode
-from rig.maya.curve import create_from_points
+from rig.maya.base import MayaBaseNode, _exists, _undo_chunk
+from rig.maya.curve import create_from_points, _write_cvs
+from rig.maya._curve_kernels import points_to_array
 
 log = get_logger(__name__)
 
@@ -33,6 +36,12 @@ class Control(MayaBaseNode):
     INT_TO_COL = {v: k for k, v in COL_TO_INT.items()} 
     EXT = '.shapes'
 
+    # Control library contents and the (path, mtime) they were read from, see _get_shapes
+    _SHAPES_CACHE = None
+    _SHAPES_KEY = None
+
+    __slots__ = ()
+
     def __init__(self, 
                  name,
                  role=None, 
@@ -51,9 +60,12 @@ class Control(MayaBaseNode):
         if not any([role, descriptor, region, side]):
             self.decompose_name()
 
+        self._setup()
+
+    def _setup(self):
         # Tag object as controller
-        if not cmds.controller(query=True, isController=True):
-            cmds.controller(name)
+        if not cmds.controller(self.long_name, query=True, isController=True):
+            cmds.controller(self.long_name)
 
     @classmethod
     def create(cls,
@@ -92,10 +104,26 @@ class Control(MayaBaseNode):
         """
         List available shapes in control library
         """
-        shapes = dataIO.load(cls.CONFIG.CONTROL_SHAPES_FILE)
+        shapes = cls._get_shapes()
         for shape in shapes:
             print(shape)
 
+    @classmethod
+    def _get_shapes(cls):
+        """
+        Get the control library, only reading it from disk
+        on first use or when the file has changed since
+        :returns dict shapes:
+        """
+        path = cls.CONFIG.CONTROL_SHAPES_FILE
+        key = (path, os.path.getmtime(path))
+
+        if Control._SHAPES_CACHE is None or Control._SHAPES_KEY != key:
+            Control._SHAPES_CACHE = dataIO.load(path)
+            Control._SHAPES_KEY = key
+
+        return Control._SHAPES_CACHE
+
     @classmethod
     def get_default_path(cls, filename=None):
         """
@@ -104,7 +132,7 @@ class Control(MayaBaseNode):
         :return str path: path to file
         """
         scene_path = cmds.file(query=True, sceneName=True)
-        scene_dir, scene_name = os.path.dirname(scene_path)
+        scene_dir, scene_name = os.path.split(scene_path)
         
         if filename and isinstance(filename, string_types):
             if not filename.endswith(cls.EXT):
@@ -125,148 +153,201 @@ class Control(MayaBaseNode):
         """
         Mirror control shapes based on selection
         """
-        sel = cmds.ls(selection=True) or []
+        with _undo_chunk():
+            sel = cmds.ls(selection=True) or []
 
-        if len(sel) != 2:
-            err = "Please select two curves. Driver -> Driven"
-            raise RuntimeError(err)
+            if len(sel) != 2:
+                err = "Please select two curves. Driver -> Driven"
+                raise RuntimeError(err)
 
-        driver = sel[0]
-        driven = sel[1]
+            driver = sel[0]
+            driven = sel[1]
 
-        driver_shapes = cmds.listRelatives(driver, shapes=True, noIntermediate=True) or []
-        driven_shapes = cmds.listRelatives(driven, shapes=True, noIntermediate=True) or []
+            driver_shapes = cmds.listRelatives(driver, shapes=True, noIntermediate=True, fullPath=True) or []
+            driven_shapes = cmds.listRelatives(driven, shapes=True, noIntermediate=True, fullPath=True) or []
 
-        if not len(driver_shapes) or not len(driven_shapes):
-            err = "Couldn't find any shapes attached to one or both objects."
-            raise RuntimeError(err)
+            if not len(driver_shapes) or not len(driven_shapes):
+                err = "Couldn't find any shapes attached to one or both objects."
+                raise RuntimeError(err)
         
-        # Format template for accessing cv's
-        cv = "{0}.cv[{1}]"
+            for driver_shape, driven_shape in zip(driver_shapes, driven_shapes):
+                msel = om.MSelectionList()
+                msel.add(driver_shape)
+                msel.add(driven_shape)
 
-        for driver_shape, driven_shape in zip(driver_shapes, driven_shapes):
-            cvs = cmds.getAttr("{0}.cp".format(driver_shape), s=1)
-            cvs_driven = cmds.getAttr("{0}.cp".format(driven_shape), s=1)
+                fn_driver = om.MFnNurbsCurve(msel.getDagPath(0))
+                fn_driven = om.MFnNurbsCurve(msel.getDagPath(1))
 
-            if cvs != cvs_driven:
-                raise RuntimeError()
+                if fn_driver.numCVs != fn_driven.numCVs:
+                    err = "{0} and {1} have a different number of cvs."
+                    raise RuntimeError(err.format(driver_shape, driven_shape))
 
-            for i in range(cvs):
-                driver_cv = cv.format(driver_shape, str(i))
-                driven_cv = cv.format(driven_shape, str(i))
+                # Read all cvs at once through the api and flip them in x
+                points = points_to_array(fn_driver.cvPositions(om.MSpace.kWorld))
+                points[:, 0] *= -1.0
 
-                driver_pos = cmds.xform(driver_cv, query=True, worldSpace=True, translation=True)
-                driven_pos = [driver_pos[0] * -1, driver_pos[1], driver_pos[2]]
-                cmds.xform(driven_cv, worldSpace=True, translation=driven_pos)
+                # Write them back in one undoable call over the whole cv range
+                _write_cvs(fn_driven, points, world=True)
 
     @classmethod
     def get_controls(cls):
         """
         Get all controls in scene as class instances
         """
-        return [cls(c) for c in cmds.controllers(allControllers=True)]
+        msel = om.MSelectionList()
+        for c in cmds.controllers(allControllers=True) or []:
+            msel.add(c)
+
+        return [cls._from_dag(msel.getDagPath(i)) for i in range(msel.length())]
 
     @classmethod
     def save_shapes(cls):
         """
         Save scene control shapes onto file relative to current scene
         """
-        shapes_data = {}
+        with _undo_chunk():
+            shapes_data = {}
 
-        for ctrl in cls.get_controls():
-            if ctrl not in shapes_data:
+            for con in cls.get_controls():
+                ctrl = con.short_name
+                if ctrl not in shapes_data:
                     shapes_data[ctrl] = {}
-        
-            for shape in ctrl.shapes:
-                if shape not in shapes_data[ctrl]:
-                    shapes_data[ctrl][shape] = {}
-
-                curve_info = cmds.createNode("curveInfo")
-                input_plug = "{0}.inputCurve".format(curve_info)
-                shape_plug = "{0}.worldSpace[0]".format(shape)
-                cmds.connectAttr(shape_plug, input_plug)
-
-                knots = "{0}.knots".format(curve_info)
-                deg = "{0}.degree".format(shape)
-                cvs = "{0}.cv[*]".format(shape)
-
-                degree = cmds.getAttr(deg)
-                period = cmds.getAttr("{0}.f".format(shape))
-                positions = cmds.getAttr(cvs)
-
-                # check empty positions
-                for pos in positions:
-                    if all(p == 0 for p in pos):
-                        cmds.select(shape)
-                        mel.eval('doBakeNonDefHistory( 1, {"prePost"});')
-                        cmds.select(clear=True)
-                        positions = cmds.getAttr(cvs)
-                        degree = cmds.getAttr(deg)
-                        period = cmds.getAttr("{0}.f".format(shape))
-                        break
-
-                knots = cmds.getAttr(knots)[0]
-
-                if period > 0:
-                    for i in range(degree):
-                        positions.append(positions[i])
-
-                knots = knots[:len(positions) + degree - 1]
-                shapes_data[ctrl][shape]['knots'] = knots
-                shapes_data[ctrl][shape]['period'] = period
-                shapes_data[ctrl][shape]['positions'] = positions
-                shapes_data[ctrl][shape]['degree'] = degree
-
-                cplug = "{0}.overrideEnabled"
-                shapes_data[ctrl][shape]['color'] = 'yellow'
-                for obj in [ctrl, shape]:
-                    if cmds.getAttr(cplug.format(obj)):
-                        color = "{0}.overrideColor".format(obj)
-                        shapes_data[ctrl][shape]['color'] = cmds.getAttr(color)
-
-                cmds.delete(curve_info)
-        
-        with open(cls.get_default_path(), 'rb') as control_file:
-            pickle.dump(shapes_data, control_file, pickle.HIGHEST_PROTOCOL)
+
+                for shape in con.shapes:
+                    if shape not in shapes_data[ctrl]:
+                        shapes_data[ctrl][shape] = {}
+
+                    # Read curve data straight from the shape, no curveInfo node needed
+                    fn_curve = om.MFnNurbsCurve(om.MSelectionList().add(shape).getDagPath(0))
+                    points = fn_curve.cvPositions(om.MSpace.kObject)
+
+                    # check empty positions
+                    for p in points:
+                        if p.x == 0 and p.y == 0 and p.z == 0:
+                            cmds.select(shape)
+                            mel.eval('doBakeNonDefHistory( 1, {"prePost"});')
+                            cmds.select(clear=True)
+                            points = fn_curve.cvPositions(om.MSpace.kObject)
+                            break
+
+                    positions = [[p.x, p.y, p.z] for p in points]
+                    degree = fn_curve.degree
+                    knots = list(fn_curve.knots())
+
+                    # Same values as the form attribute: open, closed, periodic
+                    period = fn_curve.form - om.MFnNurbsCurve.kOpen
+
+                    # Periodic curves already include their overlapping cvs,
+                    # closed curves get them appended
+                    if fn_curve.form == om.MFnNurbsCurve.kClosed:
+                        for i in range(degree):
+                            positions.append(positions[i])
+
+                    knots = knots[:len(positions) + degree - 1]
+                    shapes_data[ctrl][shape]['knots'] = knots
+                    shapes_data[ctrl][shape]['period'] = period
+                    shapes_data[ctrl][shape]['positions'] = positions
+                    shapes_data[ctrl][shape]['degree'] = degree
+
+                    cplug = "{0}.overrideEnabled"
+                    shapes_data[ctrl][shape]['color'] = cls.COL_TO_INT['yellow']
+                    for obj in [ctrl, shape]:
+                        if cmds.getAttr(cplug.format(obj)):
+                            color = "{0}.overrideColor".format(obj)
+                            shapes_data[ctrl][shape]['color'] = cmds.getAttr(color)
+
+            cls._write_shapes(cls.get_default_path(), shapes_data)
+
+    @staticmethod
+    def _write_shapes(path, shapes_data):
+        """
+        Write shapes data as a compressed npz, one set of arrays per shape
+        :param str path: file to write to
+        :param dict shapes_data: {ctrl: {shape: {positions, knots, degree, period, color}}}
+        """
+        names = []
+        arrays = {}
+
+        for ctrl in shapes_data:
+            for shape, data in shapes_data[ctrl].items():
+                key = 'shape{0}_'.format(len(names))
+                names.append((ctrl, shape))
+                arrays[key + 'positions'] = np.asarray(data['positions'], dtype=np.float64)
+                arrays[key + 'knots'] = np.asarray(data['knots'], dtype=np.float64)
+                arrays[key + 'info'] = np.array(
+                    [data['degree'], data['period'], data['color']], dtype=np.int32)
+
+        # unicode arrays load back without needing allow_pickle
+        arrays['names'] = np.array(names).reshape(-1, 2)
+
+        # pass a file object so numpy doesn't append its own extension
+        with open(path, 'wb') as control_file:
+            np.savez_compressed(control_file, **arrays)
+
+    @staticmethod
+    def _read_shapes(path):
+        """
+        Read shapes data written by _write_shapes
+        :param str path: file to read from
+        :return dict: {ctrl: {shape: {positions, knots, degree, period, color}}}
+        """
+        shapes_data = {}
+
+        with open(path, 'rb') as control_file:
+            arrays = np.load(control_file, allow_pickle=False)
+
+            for i, (ctrl, shape) in enumerate(arrays['names']):
+                key = 'shape{0}_'.format(i)
+                degree, period, color = arrays[key + 'info'].tolist()
+                shapes_data.setdefault(str(ctrl), {})[str(shape)] = {
+                    'positions': arrays[key + 'positions'].tolist(),
+                    'knots': arrays[key + 'knots'].tolist(),
+                    'degree': degree,
+                    'period': period,
+                    'color': color,
+                }
+
+        return shapes_data
 
     @classmethod
     def load_shapes(cls):
-        path = cmds.fileDialog(mode=0, directoryMask="*.shapes")
-        success = "Successfuly loaded shape {0} for {1}."
-        err = "{0} does not exist, skipping."
-
-        with open(path, 'rb') as ctrl_file:
-            shapes_data = pickle.load(ctrl_file)
-
-        for obj in shapes_data:
-            if not cmds.objExists(obj):
-                log.error(err.format(obj))
-                continue
-
-            # parent does exist
-            # delete shapes from obj
-            cmds.delete(cmds.listRelatives(obj, s=True, type="nurbsCurve"))
-
-            # initialize object as curve
-            con = cls.compose(descriptor=obj, side=cls.CONFIG.LEFT)
-
-            for shape in shapes_data[obj]:
-                shape = shapes_data[obj][shape]
-                pos = shape['positions']
-                dg = shape['degree']
-                knots = shape['knots']
-                color = shape['color']
-                period = shape['period']
-
-                p = True if period > 0 else False
-                con.color = color
-                curve = cmds.curve(degree=dg, point=pos, knot=knots, per=p)
-                con.get_shape_from(curve, destroy=True, replace=False)
-                log.info(success.format(shape, obj))
+        with _undo_chunk():
+            path = cmds.fileDialog(mode=0, directoryMask="*.shapes")
+            success = "Successfuly loaded shape {0} for {1}."
+            err = "{0} does not exist, skipping."
+
+            shapes_data = cls._read_shapes(path)
+
+            for obj in shapes_data:
+                if not _exists(obj):
+                    log.error(err.format(obj))
+                    continue
+
+                # parent does exist
+                # delete shapes from obj
+                cmds.delete(cmds.listRelatives(obj, s=True, type="nurbsCurve"))
+
+                # initialize object as curve
+                con = cls.compose(descriptor=obj, side=cls.CONFIG.LEFT)
+
+                for shape in shapes_data[obj]:
+                    shape = shapes_data[obj][shape]
+                    pos = shape['positions']
+                    dg = shape['degree']
+                    knots = shape['knots']
+                    color = shape['color']
+                    period = shape['period']
+
+                    p = True if period > 0 else False
+                    con.color = color
+                    curve = cmds.curve(degree=dg, point=pos, knot=knots, per=p)
+                    con.get_shape_from(curve, destroy=True, replace=False)
+                    log.info(success.format(shape, obj))
 
     @property
     def color(self):
-        numeric = cmds.getAttr('{}.overrideColor'.format(self.long_name))
+        fn_node = om.MFnDependencyNode(self._mobject)
+        numeric = fn_node.findPlug('overrideColor', False).asInt()
         return self.INT_TO_COL.get(numeric, numeric)
 
     @color.setter
@@ -278,28 +359,34 @@ class Control(MayaBaseNode):
         err = "Must pass an int or string for colors"
         assert isinstance(val, string_types) or isinstance(val, int), err
         col = self.COL_TO_INT[val] if isinstance(val, string_types) else val
-        cmds.setAttr("{}.overrideEnabled".format(self.long_name), 1)
-        cmds.setAttr("{}.overrideColor".format(self.long_name), col)
+
+        # Read through the plug, only write overrides that need it
+        fn_node = om.MFnDependencyNode(self._mobject)
+        if not fn_node.findPlug('overrideEnabled', False).asBool():
+            cmds.setAttr(self.plug('overrideEnabled'), 1)
+
+        cmds.setAttr(self.plug('overrideColor'), col)
 
     @property
     def null(self):
         """
         Get furthest ancestor that is a null to this object
         """
-        p = cmds.listRelatives(self.long_name, parent=True)
-        
-        if p and self.CONFIG.NULL in p[0]:
-            p = MayaBaseNode(p[0])
-            old_p = p
-        else:
-            log.debug("Parent {} is not a null".format(p))
+        # Walk up a copy of our dag path, no need for a node per ancestor
+        dag_path = om.MDagPath(self._dag)
+        null_path = None
+
+        while dag_path.length() > 1:
+            dag_path.pop()
+            if self.CONFIG.NULL not in dag_path.partialPathName():
+                break
+            null_path = om.MDagPath(dag_path)
+
+        if null_path is None:
+            log.debug("Parent of {} is not a null".format(self.short_name))
             return None
 
-        while p and self.CONFIG.NULL in p.short_name:
-            old_p = p
-            p = old_p.parent
-        
-        return old_p
+        return MayaBaseNode._from_dag(null_path)
 
     @property
     def parent(self):
@@ -313,15 +400,17 @@ class Control(MayaBaseNode):
         if not self.null:
             try:
                 cmds.parent(self.long_name, new_parent)
+                self._invalidate()
                 log.debug("Parented {} under {}".format(self.nice_name, new_parent))
                 self._parent = new_parent
             except RuntimeError:
                 msg = "Failed to parent {} under {}".format(self.short_name, new_parent)
                 log.warning(msg, exc_info=True)
         
-        elif new_parent != self.null.parent:
+        elif new_parent != self.null.parent_name:
             log.debug("Parenting null {} to parent: {}".format(self.null.nice_name, new_parent))
             self.null.parent = new_parent
+            self._invalidate()
 
     def set_shape(self, new_shape, replace=True):
         """
@@ -335,36 +424,35 @@ class Control(MayaBaseNode):
             self.get_shape_from(circle, destroy=True, replace=replace)
         else:
             # call from prebuilt control shapes saved out to a file
-            controlDict = dataIO.load(self.CONFIG.CONTROL_SHAPES_FILE)
+            controlDict = self._get_shapes()
             for child_shape in controlDict[new_shape]["shapes"]:
                 positions = controlDict[new_shape]["shapes"][child_shape]["positions"]
                 degree = controlDict[new_shape]["shapes"][child_shape]["degree"]
                 curve = create_from_points(positions, degree, self.nice_name + "_temp")
                 self.get_shape_from(curve, destroy=True, replace=replace)
 
-    def set_position(self, position, space='world'):
+    def set_position(self, position, space='world', undoable=True):
         """
         Overloaded method, sets position on parent null/offset group
         if one exists
         """
-        if self.null:
-            world = space.lower() == 'world'
-            position = tuple(position)
-            cmds.xform(self.null, worldSpace=world, translation=position)
+        null = self.null
+        if null:
+            null.set_position(position, space=space, undoable=undoable)
         else:
-            super(Control, self).set_position(position, space)
+            super(Control, self).set_position(position, space, undoable=undoable)
 
 
-    def set_rotation(self, rotation, space='world'):
+    def set_rotation(self, rotation, space='world', undoable=True):
         """
         Overloaded method, sets rotation on parent null/offset group
         if one exists
         """
-        if self.null:
-            world = space.lower() == 'world'
-            cmds.xform(self.null, worldSpace=world, rotation=rotation)
+        null = self.null
+        if null:
+            null.set_rotation(rotation, space=space, undoable=undoable)
         else:
-            super(Control, self).set_rotation(rotation, space)
+            super(Control, self).set_rotation(rotation, space, undoable=undoable)
 
     def mirror(self):
         """
@@ -394,7 +482,7 @@ class Control(MayaBaseNode):
 
         otherSide = "".join(otherSide)
 
-        if cmds.objExists(self.aligned_to):
+        if _exists(self.aligned_to):
             align_to = self.align_to.replace(self.side, otherSide)
         else:
             align_to = "world"
@@ -408,8 +496,9 @@ class Control(MayaBaseNode):
         Pops control/null to origin
         """
 
-        if cmds.objExists(self.null):
-            target = self.null
+        null = self.null
+        if null:
+            target = null.long_name
         else:
             target = self.long_name
 
@@ -441,47 +530,51 @@ class Control(MayaBaseNode):
             cmds.rename(shape, "%sShape#" % self.short_name)
 
         cmds.delete(obj)
+        self._shapes_cache = None
 
     def offset(self, n=1):
         """
         Creates null or offset groups above this control
         :param int n: number of offsets to create above
         """
-        i = 0
-        while n > i:
-            self.insert_parent()
-            i += 1
+        with _undo_chunk():
+            i = 0
+            while n > i:
+                self.insert_parent()
+                i += 1
     
     def insert_parent(self):
         """
         """
-        # Record current parent
-        orig_par = self.parent # could be None
+        with _undo_chunk():
+            # Record current parent
+            orig_par = self.parent # could be None
         
-        # Get naming flags
-        name_args = self.as_dict()
-        name_args.update(dict(node_type=self.CONFIG.NULL))
-        null_name = self.compose_name(**name_args)
+            null_name = self.compose_name(node_type=self.CONFIG.NULL,
+                                          role=self._role,
+                                          descriptor=self._descriptor,
+                                          region=self._region,
+                                          side=self._side)
         
-        log.debug("New null name is: {}".format(null_name))
-        dup = MayaBaseNode(cmds.duplicate(self.short_name, name=null_name)[0])
+            log.debug("New null name is: {}".format(null_name))
+            dup = MayaBaseNode(cmds.duplicate(self.short_name, name=null_name)[0])
         
-        if dup.shapes:
-            cmds.delete(dup.shapes)
+            if dup.shapes:
+                cmds.delete(dup.shapes)
         
-        # Parent this control under duplicate
-        self.parent = dup
+            # Parent this control under duplicate
+            self.parent = dup
         
-        # Parent duplicate under my original parent
-        if orig_par:
-            dup.parent = orig_par
+            # Parent duplicate under my original parent
+            if orig_par:
+                dup.parent = orig_par
 
     def drive_constrained(self, obj, p=False, r=False, s=False, o=False):
         """
         Establish driving relationships between control and another object
         p = position, r = rotation, s = scale, o = maintain offset
         """
-        if not cmds.objExists(obj):
+        if not _exists(obj):
             return
         if s:
             cmds.scaleConstraint(self.name, obj, mo=o)
@@ -500,7 +593,7 @@ class Control(MayaBaseNode):
         parent obj to control directly
         """
         if isinstance(obj, string_types):
-            if cmds.objExists(obj):
+            if _exists(obj):
                 cmds.parent(obj, self.name)
             else:
                 err = "Couldn't find passed obj: {0}"
@@ -513,48 +606,45 @@ class Control(MayaBaseNode):
         :param list spaces: A list of spaces
         """
 
-        # Arg check
-        assert isinstance(spaces, list), "Pass spaces as a list"
+        with _undo_chunk():
+            # Arg check
+            assert isinstance(spaces, list), "Pass spaces as a list"
 
-        err = "One or more passed spaces does not exist."
-        assert all(cmds.objExists(o) for o in spaces), err
+            err = "One or more passed spaces does not exist."
+            assert all(_exists(o) for o in spaces), err
 
-        spaces = [MayaBaseNode(n) for n in spaces]
+            spaces = [MayaBaseNode(n) for n in spaces]
         
-        parent_con = MayaBaseNode(cmds.parentConstraint(spaces, self.null, maintainOffset=True)[0])
+            parent_con = MayaBaseNode(cmds.parentConstraint(spaces, self.null, maintainOffset=True)[0])
 
-        # Figure out how the attribute of weights looks like
-        # add SPACES display attr in control
-        if not aliases:
-            prefixes = [n.nice_name.split(self.delimiter)[0] for n in spaces]
-            enum_names = [n.nice_name.lstrip(prefix) for prefix, n in zip(prefixes, spaces)]
-        else:
-            enum_names = aliases
+            # Figure out how the attribute of weights looks like
+            # add SPACES display attr in control
+            if not aliases:
+                prefixes = [n.nice_name.split(self.delimiter)[0] for n in spaces]
+                enum_names = [n.nice_name.lstrip(prefix) for prefix, n in zip(prefixes, spaces)]
+            else:
+                enum_names = aliases
 
-        # Attr names refers to the attributes on the parent constraint
-        attr_names = [s.nice_name + 'W' + str(i) for i,s in enumerate(spaces)]
+            # Attr names refers to the attributes on the parent constraint
+            attr_names = [s.nice_name + 'W' + str(i) for i,s in enumerate(spaces)]
 
-        # This dictionary maps space's short names to the parent constraint attributes
-        attr_dict = {k.short_name:v for k,v in zip(spaces, attr_names)}
+            # Add attributes in this control for spaces
+            self.add_attr('SPACE', at='enum', enumName='-' * 10, h=False, k=True)
+            self.add_attr('spaces', at='enum', enumName=':'.join(enum_names), h=False, k=True)
 
-        # Add attributes in this control for spaces
-        self.add_attr('SPACE', at='enum', enumName='-' * 10, h=False, k=True)
-        self.add_attr('spaces', at='enum', enumName=':'.join(enum_names), h=False, k=True)
+            # Lock displayable space enum
+            cmds.setAttr(self.plug('SPACE'), lock=True)
 
-        # Lock displayable space enum
-        cmds.setAttr(self.plug('SPACE'), lock=True)
+            # Connect spaces through driven key curves, one per weight,
+            # keyed on at its own space index and off at its neighbours,
+            # constant extrapolation keeps it off at every other index
+            count = len(attr_names)
+            for i, attr in enumerate(attr_names):
+                curve = cmds.createNode('animCurveUU', name="{0}_{1}".format(parent_con.nice_name, attr))
 
-        spaces_set = set(spaces)
-        
-        # Connect spaces through set driven keys
-        for enum_name, space in zip(enum_names, spaces):
-            cmds.setAttr(self.plug('spaces'), enum_names.index(enum_name))
-            
-            for other_space in spaces_set.difference([space]):
-                parent_con.set_attr(attr_dict[other_space.short_name], 0)
-                attr = attr_dict[other_space.short_name]
-                cmds.setDrivenKeyframe(parent_con.plug(attr), cd=self.plug('spaces'))
-
-            attr = attr_dict[space.short_name]
-            parent_con.set_attr(attr_dict[space.short_name], 1)
-            cmds.setDrivenKeyframe(parent_con.plug(attr), cd=self.plug('spaces'))
\ No newline at end of file
+                for j in range(max(i - 1, 0), min(i + 2, count)):
+                    cmds.setKeyframe(curve, float=j, value=float(i == j),
+                                     inTangentType='linear', outTangentType='linear')
+
+                cmds.connectAttr(self.plug('spaces'), "{0}.input".format(curve))
+                cmds.connectAttr("{0}.output".format(curve), parent_con.plug(attr))
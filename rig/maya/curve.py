@@ -1,10 +1,15 @@
 try:
     from maya import cmds
+    from maya.api import OpenMaya as om
 except ImportError:
     print("Must be in a maya environment!")
     raise
 
+import math
+import numpy as np
+
 from rig.maya.dag import get_positions
+from rig.maya._curve_kernels import points_to_array, matrix_to_array, transform_cvs
 
 def create_line(objects, attach=True, attachParents=[], name=""):
     """
@@ -38,34 +43,81 @@ def get_cvs(curve):
     :param str curve: name of curve object
     :returns list cvs: list of component cvs
     """
-    return cmds.ls("{0}.cv[*]".format(curve), flatten=True)
+    fn_curve = _get_curve_fn(curve)
+    num_cvs = fn_curve.numCVs
+
+    # Overlapping cvs of periodic curves aren't separate components
+    if fn_curve.form == om.MFnNurbsCurve.kPeriodic:
+        num_cvs -= fn_curve.degree
 
+    return ["{0}.cv[{1}]".format(curve, i) for i in range(num_cvs)]
 
-def get_cv_positions(cvs):
+
+def _get_curve_fn(curve):
     """
-    Given some components, query their position
-    in world space
-    :param list cvs:
-    :returns list positions:
+    Get an MFnNurbsCurve function set for a curve
+    :param str curve: name of curve object or shape
+    :returns MFnNurbsCurve fn:
     """
-    positions = list()
+    dag_path = om.MSelectionList().add(curve).getDagPath(0)
 
-    for cv in cvs:
-        ws = cmds.xform(cv, query=True, worldSpace=True, translation=True)
-        positions.append(ws)
+    # Work with the shape if we were given its transform
+    if dag_path.apiType() == om.MFn.kTransform:
+        dag_path.extendToShape()
 
-    return positions
+    return om.MFnNurbsCurve(dag_path)
+
+
+def _write_cvs(fn_curve, points, world=False):
+    """
+    Write cv positions back in one undoable call over the whole cv range
+    :param MFnNurbsCurve fn_curve: function set of the curve shape
+    :param ndarray points: (N, 4) array, as read from cvPositions
+    :param bool world: whether points are in world or object space
+    """
+    num_cvs = fn_curve.numCVs
+
+    # Overlapping cvs of periodic curves aren't separate components
+    if fn_curve.form == om.MFnNurbsCurve.kPeriodic:
+        num_cvs -= fn_curve.degree
+
+    cmds.xform("{0}.cv[*]".format(fn_curve.fullPathName()),
+               worldSpace=world,
+               translation=points[:num_cvs, :3].ravel().tolist())
+
+
+def get_cv_positions(curve):
+    """
+    Given a curve, query the position of its
+    CVs in world space
+    :param str curve: name of curve object
+    :returns list positions:
+    """
+    points = _get_curve_fn(curve).cvPositions(om.MSpace.kWorld)
+    return [[p.x, p.y, p.z] for p in points]
 
 
 def create_from_points(points, degree=1, name="curve#"):
-    knotList = [0]
+    """
+    Create a curve passing through given points
+    :param list points: cv positions
+    :param int degree: curve degree
+    :param str name: name for curve
+    :returns str curve:
+    """
+    num_cvs = len(points)
+    spans = num_cvs - degree
+
+    if spans < 1:
+        err = "Need more than {0} points for a degree {1} curve."
+        raise ValueError(err.format(degree, degree))
 
-    if degree == 1:
-        knotList.extend(range(1, len(points)))
-    if degree == 3:
-        knotList.extend([0])
-        knotList.extend(range(len(points) - 2))
-        knotList.extend([knotList[-1], knotList[-1]])
+    # Uniform knots, clamped with degree multiplicity at each end,
+    # for a total of num_cvs + degree - 1
+    knotList = np.concatenate((
+        np.zeros(degree - 1, dtype=np.int32),
+        np.arange(spans + 1, dtype=np.int32),
+        np.full(degree - 1, spans, dtype=np.int32))).tolist()
 
     curve = cmds.curve(degree=degree, point=points, knot=knotList)
     curve = cmds.rename(curve, name)
@@ -74,13 +126,31 @@ def create_from_points(points, degree=1, name="curve#"):
 
 
 def reorient(curve, downAxis):
+    """
+    Rotate a curve's cvs so it faces down the given axis,
+    about the center of their bounding box, like cmds.rotate on components
+    :param str curve: name of curve object
+    :param str downAxis: x, y or z, optionally negated
+    """
     x = 0
     y = 0
     z = 0
-    if downAxis == "x" or "-x":
+    if downAxis in ("x", "-x"):
         z = z + 90
-    elif downAxis == "y" or "-y":
+    elif downAxis in ("y", "-y"):
         y = 90
     else:
         x = x + 90
-    cmds.rotate(x, y, z, get_cvs(curve))
\ No newline at end of file
+
+    rotation = om.MEulerRotation(math.radians(x), math.radians(y), math.radians(z))
+
+    # Rotate all cvs in one go, about their bounding box center
+    fn_curve = _get_curve_fn(curve)
+    points = points_to_array(fn_curve.cvPositions(om.MSpace.kObject))
+    pivot = (points[:, :3].min(axis=0) + points[:, :3].max(axis=0)) * 0.5
+
+    points[:, :3] -= pivot
+    points = transform_cvs(points, matrix_to_array(rotation.asMatrix()))
+    points[:, :3] += pivot
+
+    _write_cvs(fn_curve, points)
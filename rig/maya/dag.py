@@ -1,8 +1,8 @@
-import math
 from six import string_types
 
+import numpy as np
+
 try:
-    from maya import cmds
     from maya.api import OpenMaya as om
 except ImportError:
     print("Must be in a maya environment!")
@@ -15,15 +15,20 @@ def get_list(nodes, msel=None):
     :param str|list nodes: list or single node
     :return list: MObjects representing nodes
     """
-    nodes = _process_nodes(nodes)
-    
-    if not msel:
+    if isinstance(nodes, string_types):
+        nodes = [nodes]
+
+    # An empty selection list is falsy, only create one when none was given
+    if msel is None:
         msel = om.MSelectionList()
-    
+
+    # Adding a missing node raises, no need for a separate existence check
     for node in nodes:
-        if cmds.objExists(node):
+        try:
             msel.add(node)
-    
+        except RuntimeError:
+            raise RuntimeError("{} doesn't exist.".format(node))
+
     return msel
 
 def get_dag_paths(nodes, msel=None):
@@ -49,13 +54,15 @@ def get_mobjects(nodes, msel=None):
         return msel.getDependNode(0)
     return [msel.getDependNode(i) for i in range(msel.length())]
 
-def get_function_sets(nodes, fn=om.MFnTransform):
+def get_function_sets(nodes, fn=om.MFnTransform, msel=None):
     """
     Get an OpenMaya function set that can be given dag paths as input
     :param OpenMaya function set:
+    :param MSelectionList msel: list to reuse, nodes are added to it
     :return list function_sets:
     """
-    return list(map(lambda d: fn(d), get_dag_paths(nodes)))
+    msel = get_list(nodes, msel)
+    return [fn(msel.getDagPath(i)) for i in range(msel.length())]
 
 def get_matrix(nodes, space='world'):
     """
@@ -63,46 +70,51 @@ def get_matrix(nodes, space='world'):
     :param str space:
     :return list(MMatrix) matrices:
     """
-    nodes = _process_nodes(nodes)
     matrices = list()
     world = space == 'world'
-    
-    for node in nodes:
-        mat = cmds.xform(node, query=True, matrix=True, worldSpace=world, objectSpace=not world)
-        matrices.append(om.MMatrix(mat))
-    
+
+    # Single nodes skip the batch existence check
+    if isinstance(nodes, string_types):
+        dag_paths = [_get_dag_path(nodes)]
+    else:
+        # Resolve all names in one selection list
+        msel = get_list(nodes)
+        dag_paths = [msel.getDagPath(i) for i in range(msel.length())]
+
+    # Read matrices from dag paths
+    for dag_path in dag_paths:
+        if world:
+            matrices.append(dag_path.inclusiveMatrix())
+        else:
+            # Local matrix, same as the node's matrix attribute
+            matrices.append(dag_path.inclusiveMatrix() * dag_path.exclusiveMatrixInverse())
+
     return matrices
 
-def _process_nodes(nodes):
+def _get_dag_path(node):
     """
-    Convenience function to process node arguments,
-    and verify they exist in the scene
-    
-    :param str|list nodes:
-    :returns list nodes:
-    :raises: RuntimeError when a node can't be found in the scene
+    Fast path to resolve a single node name
+    :param str node:
+    :returns MDagPath dag_path:
+    :raises: RuntimeError when node can't be found in the scene
     """
-    if isinstance(nodes, string_types):
-        nodes = [nodes]
-    for node in nodes:
-        if not cmds.objExists(node):
-            raise RuntimeError("{} doesn't exist.".format(node))
-    return nodes
+    try:
+        return om.MSelectionList().add(node).getDagPath(0)
+    except RuntimeError:
+        raise RuntimeError("{} doesn't exist.".format(node))
 
 def _process_space(space):
     """
     Get an MSpace constant based on a string or MSpace input
     :returns om.MSpace space: constant
     """
-    print(space)
-    
     if isinstance(space, string_types):
         space = space.lower()
         return om.MSpace.kWorld if space == 'world' else om.MSpace.kObject
     else: 
         return space
 
-def get_positions(nodes, space=om.MSpace.kWorld, asPoints=False):
+def get_positions(nodes, space=om.MSpace.kWorld, asPoints=False, asArray=False):
     """
     Get positions of nodes in desired space,
     if space is not equal to 'world', will use object space
@@ -114,17 +126,29 @@ def get_positions(nodes, space=om.MSpace.kWorld, asPoints=False):
         The biggest difference is MPoints supply an extra 4th value,
         and operating with matrices has different behaviors if
         dealing with points or vectors.
+    :param bool asArray: Whether to return an (N, 3) array instead
     :returns positions:
-    :rtype: MVector or MPoint when asPoints is True
+    :rtype: MVector, MPoint when asPoints is True or ndarray when asArray is True
     """
     # Ensure space is an MSpace constant
     space = _process_space(space)
     
-    # Get MFnTransforms for each node
-    transforms = get_function_sets(nodes, fn=om.MFnTransform)
-    
+    # Get MFnTransforms for each node, single nodes skip the batch existence check
+    if isinstance(nodes, string_types):
+        transforms = [om.MFnTransform(_get_dag_path(nodes))]
+    else:
+        transforms = get_function_sets(nodes, fn=om.MFnTransform)
+
+    # Fill a preallocated buffer when the caller works with arrays
+    if asArray:
+        positions = np.empty((len(transforms), 3))
+        for i, t in enumerate(transforms):
+            vec = t.translation(space)
+            positions[i] = (vec.x, vec.y, vec.z)
+        return positions
+
     # Return their translation
-    vectors = list(map(lambda t: t.translation(space), transforms))
+    vectors = [t.translation(space) for t in transforms]
 
     if not asPoints:
         return vectors
@@ -148,11 +172,15 @@ def get_rotations(nodes, space=om.MSpace.kWorld, asQuaternion=False):
 
     # Create a MTransformationMatrix for each
     transforms = [om.MTransformationMatrix(m) for m in mat]
-    
-    result = list(map(lambda t: t.rotation(asQuaternion=asQuaternion), transforms))
 
     # Return their values
     if asQuaternion:
-        return result
-    else:
-        return [[math.degrees(r) for r in eulers] for eulers in result]
\ No newline at end of file
+        return [t.rotation(asQuaternion=True) for t in transforms]
+
+    # Collect euler triples and convert them to degrees all at once
+    eulers = np.empty((len(transforms), 3))
+    for i, t in enumerate(transforms):
+        r = t.rotation()
+        eulers[i] = (r.x, r.y, r.z)
+
+    return np.degrees(eulers).tolist()
\ No newline at end of file
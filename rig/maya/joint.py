@@ -7,6 +7,9 @@ try:
 except ImportError:
     MAYA_AVAILABLE = False
 
+# Matches right side tokens in joint names
+_SIDE_RE = re.compile(r'_r\d?', flags=re.IGNORECASE)
+
 
 def get_joints():
     """
@@ -22,18 +25,18 @@ def get_joints():
     # Init dictionary for joints w/ sides
     sided_joints = defaultdict(str)
 
-    # Get all joints
+    # Get all joints, and a set of them for quick lookups
     joints = cmds.ls(type='joint')
+    joint_set = set(joints)
 
     # Find right-sided joints
-    side_matcher = re.compile(r'_r\d?', flags=re.IGNORECASE)
-    rjoints = filter(lambda v: side_matcher.search(v), joints)
+    rjoints = filter(lambda v: _SIDE_RE.search(v), joints)
 
     # Fill side dictionary
     for jnt in rjoints:
         for sub in ['_l', '_L']:
-            ljoint = side_matcher.sub(sub, jnt)
-            if cmds.objExists(ljoint):
+            ljoint = _SIDE_RE.sub(sub, jnt)
+            if ljoint in joint_set:
                 sided_joints[jnt] = ljoint
                 sided_joints[ljoint] = jnt
 
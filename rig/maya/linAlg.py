@@ -6,9 +6,56 @@ except ImportError:
     raise
 
 import logging
+import numpy as np
+
 from rig.maya import dag, get_logger
 log = get_logger(__name__)
 
+# Column of each axis in position arrays
+_AXIS_INDEX = {'x': 0, 'y': 1, 'z': 2}
+
+def _normalize(vector):
+    """
+    Normalize a vector in place, zero length vectors are left as they are,
+    same as MVector.normalize
+    :param ndarray vector:
+    :returns float length: length before normalizing
+    """
+    length = np.linalg.norm(vector)
+    if length:
+        vector /= length
+    return length
+
+
+def _build_basis(positions):
+    """
+    Get the pole vector basis from three positions, as plain arrays
+
+    :param ndarray positions: (3, 3) array of start, mid and end positions
+    :returns tuple(ndarray, ndarray, float): basis rows (aim, up, down),
+        middle position between start and end, and distance from it to mid
+    """
+    start, mid, end = positions
+
+    # Middle position between first and third joints
+    middle = (start + end) * 0.5
+
+    # Get a vector aiming down the first joint to the third one
+    downAxis = end - start
+    _normalize(downAxis)
+
+    # Get a vector aiming from the middle position, to the middle joint
+    # A straight chain leaves this at zero length, it stays zero
+    aimAxis = mid - middle
+    distanceToMid = _normalize(aimAxis)
+
+    # Get orthogonal vectors to form a basis that will describe orientation
+    upAxis = np.cross(aimAxis, downAxis)
+    downAxis = np.cross(aimAxis, upAxis)
+
+    return np.array([aimAxis, upAxis, downAxis]), middle, float(distanceToMid)
+
+
 def get_pole_vector(A, B, C, factor=2):
     """
     Given three joitns (ex: shoulder, elbow, wrist),
@@ -21,46 +68,23 @@ def get_pole_vector(A, B, C, factor=2):
     # Create a locator
     loc = cmds.spaceLocator(name="poleVector_temp")
 
-    # Get joint positions
-    positions = dag.get_positions([A, B, C], space='world')
-
-    # Get their middle position
-    middle = get_avg_pos([A, C])
-    
-    # Get a vector aiming down the first joint to the third one    
-    downAxis = positions[2] - positions[0]
-    downAxis.normalize()
-    
-    # Get a vector aiming from the middle position, to the middle joint
-    aimAxis = positions[1] - middle
-    distanceToMid = aimAxis.length()
-    aimAxis.normalize()
-
-    # Get orthogonal vectors to form a basis that will describe orientation
-    upAxis = aimAxis ^ downAxis
-    downAxis = aimAxis ^ upAxis
-    
-    # Now we can build an orthonormal basis
-    matRotation = om.MMatrix()
-    
-    matRotation.setElement(0, 0, aimAxis.x)
-    matRotation.setElement(0, 1, aimAxis.y)
-    matRotation.setElement(0, 2, aimAxis.z)
+    # Get joint positions, all in one query
+    positions = dag.get_positions([A, B, C], space='world', asArray=True)
 
-    matRotation.setElement(1, 0, upAxis.x)
-    matRotation.setElement(1, 1, upAxis.y)
-    matRotation.setElement(1, 2, upAxis.z)
+    # Aim, up and down axes, the middle position and its distance to the mid joint
+    basis, middle, distanceToMid = _build_basis(positions)
 
-    matRotation.setElement(2, 0, downAxis.x)
-    matRotation.setElement(2, 1, downAxis.y)
-    matRotation.setElement(2, 2, downAxis.z)
+    # Now we can build an orthonormal basis, one row per axis
+    rows = np.identity(4)
+    rows[:3, :3] = basis
+    matRotation = om.MMatrix(rows.ravel().tolist())
 
     # Get a rotation from it
     rotation = om.MTransformationMatrix(matRotation).rotation()
 
     # Get a matrix describing the average position between joitns
-    mat = om.MTransformationMatrix(om.MMatrix())
-    mat.translateBy(middle, om.MSpace.kWorld)
+    mat = om.MTransformationMatrix(om.MMatrix.kIdentity)
+    mat.translateBy(om.MVector(*middle.tolist()), om.MSpace.kWorld)
 
     # Orient to orthonormal basis
     mat.rotateBy(rotation, om.MSpace.kWorld)
@@ -78,20 +102,13 @@ def get_avg_pos(nodes, asPoints=False):
     :param str|list nodes:
     :return position:
     """
-    # Get positions from nodes
-    positions = dag.get_positions(nodes, asPoints=asPoints)
+    # Get positions from nodes, as an (N, 3) array
+    positions = dag.get_positions(nodes, asArray=True)
 
-    # Create an MVector to hold our result
-    result = om.MVector()
+    # Mean of positions is the mid point between them
+    result = positions.mean(axis=0).tolist()
 
-    # Do sum of positions, then divide them by number of positions
-    # to get average position, or mid point from origin
-    for pos in positions:
-        result += pos
-    
-    result /= len(positions)
-
-    return result
+    return om.MPoint(*result) if asPoints else om.MVector(*result)
 
 def average_in_axis(nodes, axis='x', space=om.MSpace.kObject):
     """
@@ -106,30 +123,23 @@ def average_in_axis(nodes, axis='x', space=om.MSpace.kObject):
     # Make sure space is an MSpace constant
     space = dag._process_space(space)
 
-    # Ensure axis input is always lower case
+    # Ensure axis input is always lower case, and get its column once
     axis = axis.lower()
+    if axis not in _AXIS_INDEX:
+        raise ValueError("Axis must be one of x, y or z, got {}".format(axis))
+    index = _AXIS_INDEX[axis]
 
     # Get MFnTransform objects from nodes
     transforms = dag.get_function_sets(nodes, fn=om.MFnTransform)
 
-    # Store their positions in a list
-    positions = [t.translation(space) for t in transforms]
+    # Store their positions in an (N, 3) array
+    positions = np.array([list(t.translation(space)) for t in transforms], dtype=np.float64)
 
-    # And add them up to calc the average position in axis
-
-    # The following line works, because vectors and points in the maya api
-    # have properties named after axes. For example, MVector.x, or MPoint.z
-    avg = sum([getattr(position, axis) for position in positions]) / len(positions)
-    
-    for mTransform, pos in zip(transforms, positions):
-        if axis == 'x':
-            newPosition = om.MVector(avg, pos.y, pos.z)
-        if axis == 'y':
-            newPosition = om.MVector(pos.x, avg, pos.z)
-        if axis == 'z':
-            newPosition = om.MVector(pos.x, pos.y, avg)
+    # Set every position in axis to their average
+    positions[:, index] = positions[:, index].mean()
 
-        mTransform.setTranslation(newPosition, space)
+    for mTransform, pos in zip(transforms, positions.tolist()):
+        mTransform.setTranslation(om.MVector(*pos), space)
 
 
 def zero(obj):
@@ -140,34 +150,37 @@ def zero(obj):
     trans_obj.setTransformation(om.MTransformationMatrix(om.MMatrix.kIdentity))
 
 
-def snap(A, B, rotate=True, translate=True):
+def snap_dag_paths(path_a, path_b, rotate=True, translate=True):
     """
-    Snaps A onto B, with the option to only do rotation,
-    translation, or both
-    """
-    # Get parent of A
-    par_a = cmds.listRelatives(A, parent=True)
-    mat_a = om.MMatrix()
-    
-    # If object A has a parent, we need its world mat
-    # to apply transformation in object space later
-    if par_a:
-        mat_a = dag.get_matrix(par_a[0], space='world')[0]
+    Snaps the node at path_a onto the node at path_b,
+    reading every matrix straight from the dag paths
+
+    :param MDagPath path_a: node to move
+    :param MDagPath path_b: node to snap to
+    :param bool rotate: Whether to do align orientation
+    :param bool translate: Whether to align position
 
+    .. note::
+        This action is not undoable
+    """
     # Compare matrices in case we're already at the same spot
-    mat_world_a, mat_world_b = dag.get_matrix([A, B], space='world')
+    mat_world_a = path_a.inclusiveMatrix()
+    mat_world_b = path_b.inclusiveMatrix()
     trans_matrix_a = om.MTransformationMatrix(mat_world_a)
     trans_matrix_b = om.MTransformationMatrix(mat_world_b)
     
     if trans_matrix_a.isEquivalent(trans_matrix_b):
-        log.error("{0} is already aligned to {1}".format(A, B))
+        log.error("{0} is already aligned to {1}".format(path_a.partialPathName(), 
+                                                         path_b.partialPathName()))
         return
 
-    # Apply B's transformation in the space of A
-    result = mat_world_b * mat_a.inverse()
+    # Apply B's transformation in the space of A's parent,
+    # the exclusive matrix is identity for nodes under the world
+    par_inv_a = path_a.exclusiveMatrixInverse()
+    result = mat_world_b * par_inv_a
     trans_result = om.MTransformationMatrix(result)
 
-    mat_local_a = dag.get_matrix(A, space='object')[0]
+    mat_local_a = mat_world_a * par_inv_a
     result_a = om.MTransformationMatrix(mat_local_a)
     
     if translate:
@@ -178,5 +191,21 @@ def snap(A, B, rotate=True, translate=True):
         result_a.setRotation(trans_result.rotation())
     
     # Apply result to A
-    xform_a = dag.get_function_sets(A, fn=om.MFnTransform)[0]
-    xform_a.setTransformation(result_a)
\ No newline at end of file
+    xform_a = om.MFnTransform(path_a)
+    xform_a.setTransformation(result_a)
+
+
+def snap(A, B, rotate=True, translate=True):
+    """
+    Snaps A onto B, with the option to only do rotation,
+    translation, or both
+    """
+    # Resolve both nodes once and read every matrix from their dag paths
+    msel = dag.get_list([A, B])
+
+    # The same node twice is merged into a single entry
+    if msel.length() < 2:
+        log.error("{0} is already aligned to {1}".format(A, B))
+        return
+
+    snap_dag_paths(msel.getDagPath(0), msel.getDagPath(1), rotate=rotate, translate=translate)
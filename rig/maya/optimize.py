@@ -22,18 +22,30 @@ def delete_unknown_nodes():
     unable = list()
     able = list()
 
-    for node in get_unknown_nodes():
-        try:
-            cmds.lockNode(node, lock=False)
-            cmds.delete(node)
-            able.append(node)
-        except RuntimeError:
-            unable.append(node)
-        except ValueError:
-            continue
+    nodes = get_unknown_nodes()
+
+    if not nodes:
+        return
+
+    # Unlock and delete everything in two calls, only go
+    # node by node to find out which ones failed
+    try:
+        cmds.lockNode(nodes, lock=False)
+        cmds.delete(nodes)
+        able = nodes
+    except RuntimeError:
+        for node in nodes:
+            try:
+                cmds.lockNode(node, lock=False)
+                cmds.delete(node)
+                able.append(node)
+            except RuntimeError:
+                unable.append(node)
+            except ValueError:
+                continue
     
     if unable:
         log.warn("Failed to delete these nodes: {}".format(unable))
     
     if able:
-        log.info("Deleted {} nodes.".format(len(able)))
\ No newline at end of file
+        log.info("Deleted {} nodes.".format(len(able)))
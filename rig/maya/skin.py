@@ -3,12 +3,13 @@ import re
 import pickle
 from functools import partial
 
+import numpy as np
+
 from rig.maya import getMayaWin
 
 try:
-    # TODO: convert calls to api 2.0
-    import maya.OpenMaya as om
-    import maya.OpenMayaAnim as omanim
+    from maya.api import OpenMaya as om
+    from maya.api import OpenMayaAnim as omanim
     import maya.cmds as cmds
     
     from PySide2 import QtGui, QtCore, QtWidgets
@@ -17,6 +18,10 @@ except ImportError:
 
 
 
+# Namespace prefixes of every token in a path
+_NAMESPACE_RE = re.compile(r'[^|:]*:')
+
+
 def show():
     dialog = SkinWeightsDialog(parent=getMayaWin())
     dialog.show()
@@ -140,6 +145,9 @@ class SkinCluster(object):
     """
 
     FILE_EXT = ".weights"
+
+    # Weights files are npz archives, which are zip files, older ones are pickles
+    NPZ_MAGIC = b'PK\x03\x04'
     WGT_DIR = "data"
     MESH_SUFFIX = ["_REN", "_GEO", "_MESH", "_ren", "_geo", "_mesh"]
 
@@ -148,7 +156,7 @@ class SkinCluster(object):
         self.meshShape = None
         self.mesh = mesh
         self.weights_path = weights_path
-        self.mobject = om.MObject()
+        self.mobject = None
 
         if self.weights_path is None:
             self.weights_path = SkinCluster.getDefaultPath()
@@ -175,12 +183,12 @@ class SkinCluster(object):
         # Get skinCluster MObject and attach to MFnSkinCluster
         # store into data member dictionary
 
-        msel = om.MSelectionList()
-        msel.add(self.skinCluster)
-        msel.getDependNode(0, self.mobject)
+        self.mobject = om.MSelectionList().add(self.skinCluster).getDependNode(0)
 
         self.fn = omanim.MFnSkinCluster(self.mobject)
-        self.data = {'weights': {}, 'blendWeights': [],
+        # Weights are stored as an (nVerts, nInfl) array,
+        # with influence names in column order
+        self.data = {'weights': None, 'influences': [], 'blendWeights': None,
                      'name': self.skinCluster}
         self.getData()
 
@@ -209,14 +217,14 @@ class SkinCluster(object):
         if not cmds.objExists(skinCluster) or not cmds.nodeType(skinCluster) == 'skinCluster':
             raise RuntimeError("%s is not a skinCluster" % skinCluster)
 
-        influences = cmds.skinCluster(skinCluster, query=True, weightedInfluence=True)
-        joints = list()
+        influences = cmds.skinCluster(skinCluster, query=True, weightedInfluence=True) or []
 
-        for i in influences:
-            if cmds.nodeType(i) == "joint":
-                joints.append(i)
+        # ls with no nodes would list the whole scene
+        if not influences:
+            return []
 
-        return joints
+        # Filter by type in a single call
+        return cmds.ls(influences, type="joint") or []
 
     @classmethod
     def export(cls, mesh=None, path=None):
@@ -246,8 +254,7 @@ class SkinCluster(object):
         elif not path.endswith(cls.FILE_EXT):
             path += cls.FILE_EXT
 
-        with open(path, 'rb') as weights_file:
-            data = pickle.load(weights_file)
+        data = cls.loadData(path)
 
         importedVtx = len(data['blendWeights'])
         meshCount = cmds.polyEvaluate(mesh, vertex=True)
@@ -261,13 +268,47 @@ class SkinCluster(object):
 
         else:
             data = cls.remapJoints(data)
-            joints = data['weights'].keys()
+            joints = data['influences']
             cmds.skinCluster(joints, mesh, tsb=True, nw=2, n=data['name'])
             skinCluster = SkinCluster(mesh)
 
         skinCluster.setData(data)
         print("Imported weights successfully from {}.".format(path))
 
+    @classmethod
+    def loadData(cls, path):
+        """
+        Load weights data from file, converting pickled files
+        saved with per influence weight lists
+        :param str path: path to weights file
+        :returns dict data:
+        """
+        with open(path, 'rb') as weights_file:
+            is_npz = weights_file.read(len(cls.NPZ_MAGIC)) == cls.NPZ_MAGIC
+            weights_file.seek(0)
+
+            if is_npz:
+                arrays = np.load(weights_file, allow_pickle=False)
+                return {'weights': arrays['weights'],
+                        'influences': [str(i) for i in arrays['influences']],
+                        'blendWeights': arrays['blendWeights'],
+                        'skinningMethod': int(arrays['skinningMethod']),
+                        'normalizeWeights': int(arrays['normalizeWeights']),
+                        'name': str(arrays['name'])}
+
+            # Legacy pickled weights
+            data = pickle.load(weights_file)
+
+        if isinstance(data['weights'], dict):
+            influences = list(data['weights'].keys())
+            weights = [data['weights'][infl] for infl in influences]
+            data['weights'] = np.array(weights, dtype=np.float64).T
+            data['influences'] = influences
+
+        data['blendWeights'] = np.asarray(data['blendWeights'], dtype=np.float64)
+
+        return data
+
     @classmethod
     def getDefaultPath(cls):
         """
@@ -297,28 +338,25 @@ class SkinCluster(object):
         """
 
         meshShape = cls.getShape(meshShape)
-        skins = cmds.ls(type="skinCluster")
-        for skin in skins:
-            try:
-                if meshShape in cmds.skinCluster(skin, query=True, g=True):
-                    return skin
-            except:
-                return None
-        return None
 
-    @classmethod
-    def removeNamespaceFrom(cls, string):
-        if ':' in string and '|' in string:
-            tokens = string.split('|')
-            result = [s.split(':')[-1] for s in tokens]
+        # Walk the mesh's own history instead of querying every skin in the scene
+        history = cmds.listHistory(meshShape, pruneDagObjects=True) or []
+        skins = cmds.ls(history, type="skinCluster")
 
-            return '|'.join(result)
+        return skins[0] if skins else None
 
-        elif ':' in string:
-            return string.split(':')[-1]
+    @classmethod
+    def removeNamespaceFrom(cls, string):
+        return _NAMESPACE_RE.sub('', string)
 
-        else:
-            return string
+    @classmethod
+    def getInfluenceNames(cls, inflPaths):
+        """
+        Get influence names without namespaces, in influence order
+        :param MDagPathArray inflPaths:
+        :returns list names:
+        """
+        return [cls.removeNamespaceFrom(path.partialPathName()) for path in inflPaths]
 
     @classmethod
     def getShape(cls, mesh, intermediate=False):
@@ -327,8 +365,13 @@ class SkinCluster(object):
         if mesh_type == 'transform':
             shapes = cmds.listRelatives(mesh, shapes=True, path=True) or []
 
+            # Query intermediate state of all shapes at once
+            intermediates = set()
+            if shapes:
+                intermediates = set(cmds.ls(shapes, intermediateObjects=True) or [])
+
             for shape in shapes:
-                is_interm = cmds.getAttr("{}.intermediateObject".format(shape))
+                is_interm = shape in intermediates
 
                 if intermediate and is_interm and cmds.listConnections(shape, source=False):
                     return shape
@@ -346,7 +389,7 @@ class SkinCluster(object):
 
     @classmethod
     def remapJoints(cls, data):
-        joints = data['weights'].keys()
+        joints = data['influences']
 
         unused_imports = []
         no_match = set([cls.removeNamespaceFrom(x)
@@ -363,23 +406,20 @@ class SkinCluster(object):
             dialog.setInfl(unused_imports, no_match)
             dialog.exec_()
 
+            # Columns stay in place, only their influence names change
             for src, dst in dialog.mapping.items():
-                data['weights'][dst] = data['weights'][src]
-                del data['weights'][src]
+                data['influences'][data['influences'].index(src)] = dst
 
         return data
 
     def importWeights(self, path=None):
-        self.getData()
-
         if path is None:
             path = os.path.join(self.weights_path, self.mesh + self.FILE_EXT)
 
         elif not path.endswith(SkinCluster.FILE_EXT):
             path += SkinCluster.FILE_EXT
 
-        with open(path, 'rb') as weightsFile:
-            data = pickle.load(weightsFile)
+        data = SkinCluster.loadData(path)
 
         importedVtx = len(data['blendWeights'])
         meshCount = cmds.polyEvaluate(self.meshShape, vertex=True)
@@ -404,8 +444,15 @@ class SkinCluster(object):
             print("Making directory at: {}".format(directory))
             os.makedirs(directory)
 
+        # Pass a file object so numpy keeps our extension
         with open(path, 'wb') as weightsFile:
-            pickle.dump(self.data, weightsFile, pickle.HIGHEST_PROTOCOL)
+            np.savez_compressed(weightsFile,
+                                weights=self.data['weights'],
+                                influences=np.array(self.data['influences']),
+                                blendWeights=self.data['blendWeights'],
+                                skinningMethod=self.data['skinningMethod'],
+                                normalizeWeights=self.data['normalizeWeights'],
+                                name=np.array(self.data['name']))
 
         print("Exported skin weights to {} successfully.".format(path))
 
@@ -438,70 +485,79 @@ class SkinCluster(object):
         are being affected by self.skinCluster
         """
 
-        fn_set = om.MFnSet(self.fn.deformerSet())
-        members = om.MSelectionList()
-        fn_set.getMembers(members, False)
-
-        dagPath = om.MDagPath()
-        components = om.MObject()
+        fn_set = om.MFnSet(self.fn.deformerSet)
+        members = fn_set.getMembers(False)
 
-        members.getDagPath(0, dagPath, components)
+        dagPath, components = members.getComponent(0)
 
         return dagPath, components
 
     def _getCurrentWeights(self, dagPath, components):
-        weights = om.MDoubleArray()
-        util = om.MScriptUtil()
-        util.createFromInt(0)
-        uint_ptr = util.asUintPtr()
-        self.fn.getWeights(dagPath, components, weights, uint_ptr)
-        return weights
+        """
+        :returns tuple(MDoubleArray, int): flat weights and number of influences
+        """
+        return self.fn.getWeights(dagPath, components)
 
-    def setWeights(self, dagPath, components):
-        weights = self._getCurrentWeights(dagPath, components)
+    @staticmethod
+    def _toArray(weights, nInfl):
+        """
+        Copy flat weights into an (nVerts, nInfl) array, in a single pass
+        :param MDoubleArray weights: weights as returned by MFnSkinCluster.getWeights
+        :param int nInfl: number of influences
+        :returns ndarray weights:
+        """
+        return np.array(weights, dtype=np.float64).reshape(-1, nInfl)
 
-        inflPaths = om.MDagPathArray()
-        nInfl = self.fn.influenceObjects(inflPaths)
+    @staticmethod
+    def _toDoubleArray(values):
+        """
+        Build an MDoubleArray from an array or list of floats in one go
+        :param ndarray|list values:
+        :returns MDoubleArray:
+        """
+        return om.MDoubleArray(np.ravel(values).tolist())
 
-        inflPerVtx = weights.length() / nInfl
+    def setWeights(self, dagPath, components):
+        weights, nInfl = self._getCurrentWeights(dagPath, components)
+        inflPaths = self.fn.influenceObjects()
 
-        for imported_infl, imported_weights in self.data['weights'].items():
-            for ii in range(inflPaths.length()):
-                infl = inflPaths[ii].partialPathName()
-                infl = SkinCluster.removeNamespaceFrom(infl)
+        # One row per vertex, one column per influence
+        weightsArray = SkinCluster._toArray(weights, nInfl)
 
-                if infl == imported_infl:
-                    for jj in range(inflPerVtx):
-                        weights.set(imported_weights[jj], jj * nInfl + ii)
+        # Map influence names to their columns once, first match wins
+        name_to_idx = {}
+        for ii, infl in enumerate(SkinCluster.getInfluenceNames(inflPaths)):
+            name_to_idx.setdefault(infl, ii)
 
-                    break
+        # Pair imported columns with existing ones, then copy them in one go
+        src, dst = [], []
+        for jj, imported_infl in enumerate(self.data['influences']):
+            ii = name_to_idx.get(imported_infl)
+            if ii is None:
+                continue
+            src.append(jj)
+            dst.append(ii)
 
-        inflIndices = om.MIntArray(nInfl)
+        weightsArray[:, dst] = self.data['weights'][:, src]
 
-        for ii in range(nInfl):
-            inflIndices.set(ii, ii)
+        weights = SkinCluster._toDoubleArray(weightsArray)
+
+        inflIndices = om.MIntArray(list(range(nInfl)))
 
         self.fn.setWeights(dagPath, components, inflIndices, weights, False)
 
     def setBlendWeights(self, dagPath, components):
-        blendWeights = om.MDoubleArray(len(self.data['blendWeights']))
-        for i, w in enumerate(self.data['blendWeights']):
-            blendWeights.set(w, i)
+        blendWeights = SkinCluster._toDoubleArray(self.data['blendWeights'])
         self.fn.setBlendWeights(dagPath, components, blendWeights)
 
     def getInfluenceWeights(self, dagPath, components):
-        weights = self._getCurrentWeights(dagPath, components)
-        inflPaths = om.MDagPathArray()
-
-        nInfl = self.fn.influenceObjects(inflPaths)
-        inflPerVtx = weights.length() / nInfl
+        weights, nInfl = self._getCurrentWeights(dagPath, components)
+        inflPaths = self.fn.influenceObjects()
 
-        for idx in range(inflPaths.length()):
-            infl = inflPaths[idx].partialPathName()
-            infl = SkinCluster.removeNamespaceFrom(infl)
-            self.data['weights'][infl] = [weights[jj * nInfl + idx] for jj in range(inflPerVtx)]
+        # One row per vertex, one column per influence
+        self.data['weights'] = SkinCluster._toArray(weights, nInfl)
+        self.data['influences'] = SkinCluster.getInfluenceNames(inflPaths)
 
     def getBlendWeights(self, dagPath, components):
-        weights = om.MDoubleArray()
-        self.fn.getBlendWeights(dagPath, components, weights)
-        self.data['blendWeights'] = [weights[i] for i in range(weights.length())]
\ No newline at end of file
+        weights = self.fn.getBlendWeights(dagPath, components)
+        self.data['blendWeights'] = np.array(weights, dtype=np.float64)
\ No newline at end of file
@@ -3,13 +3,25 @@ import pickle
 import sys
 import os
 
+# Faster parser if available, only used to read since it can't indent by 4
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 JSON_INDENT = 4
 
-def dump(data):
+def dump(data, f=None):
     """
-    Tries to convert a python object into a dictionary
+    Tries to convert a python object into a dictionary,
+    writes it straight to f if a file object is given
+    :param data:
+    :param file f:
+    :returns str|None result: json string when no file was given
     """
     try:
+        if f is not None:
+            return json.dump(data, f, sort_keys=True, indent=JSON_INDENT)
         result = json.dumps(data, sort_keys=True, indent=JSON_INDENT)
     except BaseException:
         raise RuntimeError("Unable to serialize passed in object")
@@ -34,7 +46,7 @@ def save(data, filepath):
         os.makedirs(directory)
     
     with open(filepath, 'w') as f:
-        f.write(dump(data))
+        dump(data, f)
 
 def load(filepath):
     """
@@ -45,8 +57,17 @@ def load(filepath):
     err = "File doesn't exist: {}"
     assert os.path.isfile(filepath), err.format(filepath)
     data = dict()
-    
-    with open(filepath, 'r') as f:
-        data = json.loads(f.read())
-    
+
+    if orjson is not None:
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # json writes NaN and Infinity, which orjson rejects
+            data = json.loads(raw.decode('utf-8'))
+    else:
+        with open(filepath, 'r') as f:
+            data = json.load(f)
+
     return data
\ No newline at end of file